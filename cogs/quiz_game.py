@@ -11,7 +11,7 @@ from models.scheduled_quiz import TimedQuizController
 from utils.helpers import has_required_role
 from utils.db_utilsv2 import get_quiz_name, has_taken_quiz, set_guild_setting
 from models.solo_quiz_ephemeral import quiz_queue
-from models.solo_quiz_dm import QuizQueue
+from models.solo_quiz_dm import QuizQueue, COOLDOWN_SETTING_KEY
 
 logger = logging.getLogger('badgey.quiz_creation')
 
@@ -164,15 +164,34 @@ class QuizPlayCog(commands.Cog):
         setting_key = 'quiz_results_channel_id'
         setting_value = str(channel.id)
         
-        try:
-            await set_guild_setting(guild_id, setting_key, setting_value)
+        if await set_guild_setting(guild_id, setting_key, setting_value):
             await interaction.response.send_message(
                 f"Quiz results channel has been set to {channel.mention} for this server. Results from DM quizzes will be reported here.",
                 ephemeral=True
             )
-        except Exception as e: # Catch potential DB errors
-             logger.error(f"Failed to set results channel for guild {guild_id}: {e}")
-             await interaction.response.send_message("Failed to save the results channel setting. Please try again later.", ephemeral=True)
+        else:
+            await interaction.response.send_message("Failed to save the results channel setting. Please try again later.", ephemeral=True)
+
+    @app_commands.command(name="set_quiz_cooldown", description="Set how long users must wait between DM quizzes")
+    @app_commands.describe(seconds="Cooldown in seconds between DM quizzes for each user")
+    async def set_quiz_cooldown(self, interaction: discord.Interaction, seconds: app_commands.Range[int, 0, 86400]):
+        """Set the DM quiz cooldown for this server"""
+        if not interaction.guild:
+            await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
+            return
+        
+        if not has_required_role(interaction.user, CONFIG['REQUIRED_ROLES']):
+            await interaction.response.send_message("You don't have permission to use this command!", ephemeral=True)
+            return
+        
+        # set_guild_setting logs database errors itself and reports them through its return value
+        if await set_guild_setting(interaction.guild.id, COOLDOWN_SETTING_KEY, str(seconds)):
+            await interaction.response.send_message(
+                f"DM quiz cooldown has been set to {seconds} seconds for this server.",
+                ephemeral=True
+            )
+        else:
+            await interaction.response.send_message("Failed to save the quiz cooldown setting. Please try again later.", ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(QuizPlayCog(bot))
@@ -50,6 +50,12 @@ class BadgeyBot(commands.Bot):
         # No need to sync commands with Discord for text commands
         logger.info("Text commands ready to use")
     
+    async def close(self):
+        # Let queued and in-flight quiz score writes finish before the database goes away
+        from utils.db_utilsv2 import flush_score_writes
+        await flush_score_writes()
+        await super().close()
+    
     def handle_asyncio_exception(self, loop, context):
         """Handle uncaught exceptions in the asyncio event loop"""
         exception = context.get('exception')
@@ -0,0 +1,40 @@
+import json
+import logging
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger('badgey.quiz_question')
+
+DEFAULT_MAX_SCORE = 10
+
+class QuizQuestion(NamedTuple):
+    """A quiz question with its options parsed, and its embed fields built, once at load time"""
+    question_id: int
+    text: str
+    options: dict
+    correct: str
+    max_score: int
+    explanation: Optional[str]
+    fields: tuple  # Embed field dicts for the options; copy the tuple into a list before use
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a question from a get_quiz_questions row, falling back on bad options or scores"""
+        try:
+            options = json.loads(row[3])
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in options for question {row[0]}: {row[3]}")
+            options = {"A": "Error loading options", "B": "Please report this issue"}
+        try:
+            max_score = int(row[5])
+        except (IndexError, TypeError, ValueError):
+            max_score = DEFAULT_MAX_SCORE
+            logger.warning(f"Invalid max score for question {row[0]}, using default of {max_score}")
+        return cls(
+            question_id=row[0],
+            text=row[2],
+            options=options,
+            correct=row[4],
+            max_score=max_score,
+            explanation=row[6] if len(row) > 6 else None,
+            fields=tuple({"name": str(key), "value": str(value), "inline": False} for key, value in options.items())
+        )
@@ -697,11 +697,16 @@ class TimedQuizController:
         
         # Timer countdown
         time_left = self.timer
+        footer_text = embed.footer.text
         while time_left > 0:
             # Update every 5 seconds or when time is low
             if time_left % 5 == 0 or time_left <= 5:
-                embed.set_footer(text=f"Time remaining: {time_left} seconds")
-                await self.question_message.edit(embed=embed)
+                new_footer = f"Time remaining: {time_left} seconds"
+                # Only touch the embed when the visible text actually changed
+                if new_footer != footer_text:
+                    footer_text = new_footer
+                    embed.set_footer(text=footer_text)
+                    await self.question_message.edit(embed=embed)
             await asyncio.sleep(1)
             time_left -= 1
         
@@ -731,8 +736,10 @@ class TimedQuizController:
         await self.question_message.edit(embed=answer_embed)
         
         # Update all player interfaces to show the correct answer
+        # The text for players who didn't answer is identical, so format it once
+        default_text = f"⌛ You didn't answer in time. Correct answer: {correct_answer}"
         for player_id in list(self.player_quiz_messages.keys()):  # Use list() to avoid modification during iteration
-            await self.show_answer_to_player(player_id, question_id, correct_answer)
+            await self.show_answer_to_player(player_id, question_id, correct_answer, default_text)
         
         # Short pause between questions
         await asyncio.sleep(3)
@@ -850,7 +857,7 @@ class TimedQuizController:
                 return False
 
     @catch_and_log
-    async def show_answer_to_player(self, player_id, question_id, correct_answer):
+    async def show_answer_to_player(self, player_id, question_id, correct_answer, default_text=None):
         """Show the answer for the current question to a player"""
         player_message = self.player_quiz_messages.get(player_id)
         if not player_message:
@@ -863,6 +870,8 @@ class TimedQuizController:
                 player_answer = f"✅ Your answer: {answer} (Correct!)"
             else:
                 player_answer = f"❌ Your answer: {answer} (Incorrect. Correct: {correct_answer})"
+        elif default_text is not None:
+            player_answer = default_text
         else:
             player_answer = f"⌛ You didn't answer in time. Correct answer: {correct_answer}"
             
@@ -957,15 +966,28 @@ class TimedQuizController:
                     ephemeral=True
                 )
 
+    def _compute_rank(self, player_id):
+        """Compute a single player's rank without sorting the whole scoreboard"""
+        player_score = self.player_scores.get(player_id, 0)
+        rank = 1
+        seen = False
+        # Ties keep insertion order, matching the stable sort used in show_results
+        for pid, score in self.player_scores.items():
+            if pid == player_id:
+                seen = True
+            elif score > player_score or (score == player_score and not seen):
+                rank += 1
+        return rank if seen else 0
+
     @catch_and_log
-    async def show_player_final_results(self, player_id, interaction=None):
+    async def show_player_final_results(self, player_id, interaction=None, rank_by_pid=None):
         """Show final results to a specific player"""
         # Get player's score and rank
         player_score = self.player_scores.get(player_id, 0)
-        
-        # Sort players by score to find rank
-        sorted_scores = sorted(self.player_scores.items(), key=lambda x: x[1], reverse=True)
-        player_rank = next((idx+1 for idx, (pid, _) in enumerate(sorted_scores) if pid == player_id), 0)
+        if rank_by_pid is not None:
+            player_rank = rank_by_pid.get(player_id, 0)
+        else:
+            player_rank = self._compute_rank(player_id)
         
         # Create final results embed
         rank_text = f"🥇 1st place" if player_rank == 1 else f"🥈 2nd place" if player_rank == 2 else f"🥉 3rd place" if player_rank == 3 else f"{player_rank}th place"
@@ -1079,8 +1101,13 @@ class TimedQuizController:
             await self.registration_view.message.edit(embed=complete_embed, view=self.registration_view)
         
         # Update each player's interface with their final result
-        for player_id in list(self.player_quiz_messages.keys()):
-            await self.show_player_final_results(player_id)
+        rank_by_pid = {player_id: rank for rank, (player_id, _) in enumerate(sorted_scores, 1)}
+        # Only players with both a live interface and a score need an edit
+        targets = self.player_quiz_messages.keys() & self.player_scores.keys()
+        await asyncio.gather(
+            *(self.show_player_final_results(player_id, rank_by_pid=rank_by_pid) for player_id in targets),
+            return_exceptions=True
+        )
                 
         # Record scores in database
         for player_id, score in self.player_scores.items():
@@ -267,22 +267,25 @@ class IndividualQuizButton(discord.ui.Button):
                 )
             
             # Add a "Next" button
-            next_button = discord.ui.Button(label="Next Question", style=discord.ButtonStyle.primary)
-            
-            async def next_callback(next_interaction):
-                if next_interaction.user.id != self.quiz_view.user_id:
-                    await next_interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                    return
-                
-                await next_interaction.response.defer()
-                
-                # Move to the next question
-                self.quiz_view.index += 1
-                self.quiz_view.transitioning = False
-                await self.quiz_view.show_question()
-            
-            next_button.callback = next_callback
-            self.quiz_view.add_item(next_button)
+            self.quiz_view.add_item(_NextButton())
             
             # Update message with disabled answer buttons, feedback, and next button
-            await interaction.response.edit_message(embed=embed, view=self.quiz_view)
\ No newline at end of file
+            await interaction.response.edit_message(embed=embed, view=self.quiz_view)
+
+class _NextButton(discord.ui.Button):
+    """Button that advances an individual quiz to the next question"""
+    def __init__(self):
+        super().__init__(label="Next Question", style=discord.ButtonStyle.primary)
+
+    async def callback(self, interaction: discord.Interaction):
+        quiz_view = self.view
+        if interaction.user.id != quiz_view.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        
+        # Move to the next question
+        quiz_view.index += 1
+        quiz_view.transitioning = False
+        await quiz_view.show_question()
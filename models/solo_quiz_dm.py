@@ -3,179 +3,317 @@ from discord.ext import commands
 import logging
 import asyncio
 import time
-import json
+import heapq
+import itertools
+from collections import OrderedDict
 from config import CONFIG
-from utils.db_utilsv2 import get_quiz_questions, record_user_score, get_quiz_name
+from models.quiz_question import QuizQuestion
+from utils.db_utilsv2 import get_quiz_questions, queue_user_score, get_quiz_name, get_guild_setting
 
 logger = logging.getLogger('badgey.solo_quiz_dm')
 
+# How long the Next Question / End Quiz button stays usable (discord.ui.View's default)
+PROGRESSION_VIEW_TIMEOUT = 180
+
+# Embed colors, built once instead of on every embed
+QUESTION_COLOR = discord.Color.blue()
+COMPLETE_COLOR = discord.Color.green()
+RESULTS_COLOR = discord.Color.gold()
+
+# Guild setting that overrides the default DM quiz cooldown, in seconds
+COOLDOWN_SETTING_KEY = 'dm_quiz_cooldown_seconds'
+
+# Upper bound on users tracked for the DM quiz cooldown
+MAX_TRACKED_COOLDOWNS = 10_000
+
+# Source of compact, process-unique quiz instance IDs embedded in button custom_ids
+_quiz_instance_ids = itertools.count(1)
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-run
+_background_tasks = set()
+
+def _spawn_background(coro):
+    """Run a coroutine in the background without awaiting it"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+# Caps concurrent result sends so a burst of finishing quizzes doesn't run into Discord's rate limits
+MAX_CONCURRENT_RESULT_SENDS = 10
+_result_send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESULT_SENDS)
+
+async def _send_limited(coro):
+    """Await a Discord send once a result-send slot is free"""
+    async with _result_send_semaphore:
+        return await coro
+
+# Shared auto-end scheduler: one task sleeps until the nearest deadline instead of one task per quiz
+_auto_end_heap = []  # (deadline, sequence, quiz, timeout_seconds)
+_auto_end_sequence = itertools.count()
+_auto_end_wake = asyncio.Event()
+_auto_end_driver_task = None
+
+async def _auto_end_driver():
+    """Fire each scheduled auto-end once its deadline passes"""
+    loop = asyncio.get_running_loop()
+    while True:
+        _auto_end_wake.clear()
+        if not _auto_end_heap:
+            await _auto_end_wake.wait()
+            continue
+        delay = _auto_end_heap[0][0] - loop.time()
+        if delay > 0:
+            # Sleep until the nearest deadline, or until an earlier one is scheduled
+            try:
+                await asyncio.wait_for(_auto_end_wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        _, _, quiz, timeout_seconds = heapq.heappop(_auto_end_heap)
+        _spawn_background(quiz.auto_end_quiz(timeout_seconds))
+
+def _schedule_auto_end(quiz, timeout_seconds):
+    """Have the shared scheduler auto-end a quiz after timeout_seconds"""
+    global _auto_end_driver_task
+    if _auto_end_driver_task is None or _auto_end_driver_task.done():
+        _auto_end_driver_task = asyncio.create_task(_auto_end_driver())
+    deadline = asyncio.get_running_loop().time() + timeout_seconds
+    heapq.heappush(_auto_end_heap, (deadline, next(_auto_end_sequence), quiz, timeout_seconds))
+    _auto_end_wake.set()
+
 class QuizQueue:
     """Manages a queue of users waiting to take quizzes with rate limiting"""
+    __slots__ = ('queue', 'active_quizzes', 'cooldown', '_cooldown_heap')
+    
     def __init__(self):
-        self.queue = []  # List of (user_id, channel_id, guild_id, user, quiz_id, timer, user_name) tuples
-        self.active_quizzes = {}  # Map of user_id to timestamp of when they started
-        self.cooldown = 300  # Cooldown period in seconds (5 minutes)
-        self.lock = asyncio.Lock()
+        self.queue = asyncio.Queue()  # Queue of (user_id, channel_id, guild_id, user, quiz_id, timer, user_name, cooldown) tuples
+        self.active_quizzes = OrderedDict()  # Map of user_id to monotonic time their cooldown ends, oldest first
+        self.cooldown = 300  # Default cooldown period in seconds (5 minutes), used unless the guild sets its own
+        self._cooldown_heap = []  # Min-heap of (expiry_time, user_id) for lazy eviction
+    
+    async def _cooldown_for(self, guild_id):
+        """Get the guild's cooldown in seconds (the setting lookup is cached in db_utilsv2)"""
+        if guild_id is None:
+            return self.cooldown
+        try:
+            value = await get_guild_setting(guild_id, COOLDOWN_SETTING_KEY)
+            return max(0, int(value)) if value is not None else self.cooldown
+        except Exception as e:
+            logger.warning("Using default quiz cooldown for guild %s: %s", guild_id, e)
+            return self.cooldown
+    
+    def _evict_expired(self, current_time):
+        """Drop cooldown entries whose expiry has passed"""
+        while self._cooldown_heap and self._cooldown_heap[0][0] <= current_time:
+            _, uid = heapq.heappop(self._cooldown_heap)
+            # The heap entry may be stale if the user started another quiz since
+            expiry = self.active_quizzes.get(uid)
+            if expiry is not None and expiry <= current_time:
+                del self.active_quizzes[uid]
+    
+    def _mark_active(self, user_id, cooldown):
+        """Start the cooldown for a user whose quiz is starting"""
+        expiry = time.monotonic() + cooldown
+        self.active_quizzes[user_id] = expiry
+        self.active_quizzes.move_to_end(user_id)
+        # Cap memory; the oldest entry's cooldown has almost certainly expired
+        if len(self.active_quizzes) > MAX_TRACKED_COOLDOWNS:
+            self.active_quizzes.popitem(last=False)
+        heapq.heappush(self._cooldown_heap, (expiry, user_id))
     
     async def add_to_queue(self, user_id, channel_id, guild_id, user, quiz_id, timer, user_name=None):
         """Add a user to the quiz queue if they're not on cooldown"""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Check if user is on cooldown
-            if user_id in self.active_quizzes:
-                last_quiz_time = self.active_quizzes[user_id]
-                time_elapsed = current_time - last_quiz_time
-                
-                if time_elapsed < self.cooldown:
-                    time_remaining = int(self.cooldown - time_elapsed)
-                    return False, f"You need to wait {time_remaining} seconds before starting another quiz."
-            
-            # Add user to queue
-            self.queue.append((user_id, channel_id, guild_id, user, quiz_id, timer, user_name))
-            position = len(self.queue)
-            
-            return True, f"You've been added to the quiz queue. Position: {position}"
+        # Look up the guild's cooldown here rather than in process_queue, so a slow or failing
+        # lookup only holds up this request and not every quiz queued behind it
+        cooldown = await self._cooldown_for(guild_id)
+        
+        # Nothing below awaits, so the cooldown check and the enqueue can't interleave with process_queue
+        current_time = time.monotonic()
+        self._evict_expired(current_time)
+        
+        # Check if user is on cooldown
+        expiry = self.active_quizzes.get(user_id)
+        if expiry is not None:
+            if current_time < expiry:
+                time_remaining = int(expiry - current_time)
+                return False, f"You need to wait {time_remaining} seconds before starting another quiz."
+            
+            # Cooldown has passed, forget the old entry
+            del self.active_quizzes[user_id]
+        
+        # Add user to queue, waking process_queue if it is idle
+        self.queue.put_nowait((user_id, channel_id, guild_id, user, quiz_id, timer, user_name, cooldown))
+        position = self.queue.qsize()
+        
+        return True, f"You've been added to the quiz queue. Position: {position}"
     
     async def process_queue(self, bot):
-        """Process the quiz queue periodically"""
+        """Process the quiz queue as users are added"""
         while True:
             try:
-                async with self.lock:
-                    if self.queue:
-                        # Process the next item in queue
-                        user_id, channel_id, user, quiz_id, timer, user_name = self.queue[0]
-                        self.queue.pop(0)
-                        
-                        # Mark as active
-                        self.active_quizzes[user_id] = time.time()
-                        
-                        # Start the quiz for this user
-                        try:
-                            # Create the quiz view
-                            quiz_view = DMQuizView(user_id, channel_id, user, bot, quiz_id, timer, user_name)
-                            success = await quiz_view.initialize(quiz_id)
-                            
-                            if success:
-                                # Start the quiz in a background task
-                                bot.loop.create_task(quiz_view.run_quiz())
-                            else:
-                                # Clean up failed initializations
-                                if user_id in self.active_quizzes:
-                                    del self.active_quizzes[user_id]
-                        except Exception as e:
-                            logger.error(f"Error starting quiz for user {user_id}: {e}")
-                            try:
-                                await user.send(f"Sorry, there was an error starting your quiz: {str(e)}")
-                            except:
-                                pass
-                            # Clean up on error
-                            if user_id in self.active_quizzes:
-                                del self.active_quizzes[user_id]
-                    
-                    # Clean up expired cooldowns
-                    current_time = time.time()
-                    expired = [uid for uid, start_time in self.active_quizzes.items() 
-                              if current_time - start_time > self.cooldown]
-                    
-                    for uid in expired:
-                        del self.active_quizzes[uid]
+                # Sleep until a user is queued
+                item = await self.queue.get()
+                
+                # Mark as active, with the cooldown of the guild the quiz was started from
+                self._mark_active(item[0], item[7])
+                
+                # Start the quiz in the background so one slow startup doesn't hold up the rest of the queue
+                _spawn_background(self._start_quiz(bot, item))
                 
             except Exception as e:
-                logger.error(f"Error processing quiz queue: {e}")
+                logger.error("Error processing quiz queue: %s", e)
+    
+    async def _start_quiz(self, bot, item):
+        """Initialize and run the quiz for a dequeued user, clearing their cooldown if it fails to start"""
+        user_id, channel_id, guild_id, user, quiz_id, timer, user_name, _ = item
+        try:
+            # Create the quiz view
+            quiz_view = DMQuizView(user_id, channel_id, user, bot, quiz_id, timer, user_name)
+            success = await quiz_view.initialize(quiz_id)
             
-            # Check the queue every 5 seconds
-            await asyncio.sleep(5)
+            if success:
+                # Start the quiz in a background task
+                bot.loop.create_task(quiz_view.run_quiz())
+            else:
+                # Clean up failed initializations
+                self.active_quizzes.pop(user_id, None)
+        except Exception as e:
+            logger.error("Error starting quiz for user %s: %s", user_id, e)
+            try:
+                await user.send(f"Sorry, there was an error starting your quiz: {str(e)}")
+            except discord.HTTPException:
+                pass
+            # Clean up on error
+            self.active_quizzes.pop(user_id, None)
 
 class DMQuizView:
     """View for displaying individual quiz questions and handling responses in direct messages"""
+    __slots__ = (
+        'quiz_id', 'user_id', 'user_name', 'channel_id', 'user', 'bot', 'score',
+        'current_index', 'questions', 'timer_duration', 'current_message',
+        'quiz_instance_id', 'is_running', '_started', '_question_done',
+        '_timer_task', '_question_shown_at', 'view', '_option_buttons', 'answered',
+        '_quiz_ended', '_auto_end_armed', 'quiz_name', 'creator_username', 'channel', 'dm_channel',
+        '_inv_timer', '_last_index'
+    )
+    
     def __init__(self, user_id, channel_id, user, bot, quiz_id, timer, user_name=None):
         self.quiz_id = quiz_id
         self.user_id = user_id
         self.user_name = user_name or f"User-{user_id}"
         self.channel_id = channel_id
+        self.channel = None  # Resolved once in initialize and reused when reporting results
         self.user = user
+        self.dm_channel = None  # The user's DM channel, opened in initialize
         self.bot = bot
         self.score = 0
         self.current_index = 0
         self.questions = []
+        self._last_index = -1  # Index of the final question, set once the questions are loaded
         self.timer_duration = timer
+        self._inv_timer = 1.0 / timer if timer else 0.0  # Scales answer time into the time penalty
         self.current_message = None
-        self.quiz_instance_id = f"{user_id}_{int(time.time())}"
+        self.quiz_instance_id = str(next(_quiz_instance_ids))
         self.is_running = False
+        self._started = asyncio.Event()  # Set when the user clicks 'Start Quiz'
+        self._question_done = asyncio.Event()  # Set when the current question is answered or times out
+        self._timer_task = None  # Timer task of the current question, cancelled once it is answered
+        self._question_shown_at = None  # Monotonic time the current question was displayed
         self.view = None
+        self._option_buttons = {}  # Option key -> answer button of the current question
         self.answered = False  # Track if the current question has been answered
         self._quiz_ended = False  # Flag to track if quiz has been ended
-        self._auto_end_task = None  # Store the auto-end task for cancellation
+        self._auto_end_armed = False  # Whether the shared scheduler will auto-end this quiz
+        self.quiz_name = None  # Quiz name and creator, resolved once in initialize
+        self.creator_username = "Unknown"
     
     async def initialize(self, quiz_id):
         """Initialize the quiz by loading questions"""
         try:
-            # Get quiz questions
-            self.questions = await get_quiz_questions(quiz_id)
+            # Open the DM channel once; every later message goes straight to it
+            self.dm_channel = self.user.dm_channel or await self.user.create_dm()
+            
+            # Get quiz questions and quiz name together rather than one after the other
+            question_rows, quiz_result = await asyncio.gather(
+                get_quiz_questions(quiz_id), get_quiz_name(quiz_id), return_exceptions=True
+            )
+            # The questions are required, but the quiz can still run under a generic name
+            if isinstance(question_rows, Exception):
+                raise question_rows
+            if isinstance(quiz_result, Exception):
+                logger.warning("Could not load details for quiz %s: %s", quiz_id, quiz_result)
+                quiz_result = None
+            
+            # Parse each question up front
+            self.questions = [QuizQuestion.from_row(row) for row in question_rows]
+            self._last_index = len(self.questions) - 1
             if not self.questions:
-                logger.error(f"No questions found for quiz {quiz_id}")
-                await self.user.send(f"Sorry, no questions found for quiz ID {quiz_id}.")
+                logger.error("No questions found for quiz %s", quiz_id)
+                await self.dm_channel.send(f"Sorry, no questions found for quiz ID {quiz_id}.")
                 return False
             
-            # Get quiz name
-            quiz_result = await get_quiz_name(quiz_id)
             quiz_name = quiz_result[0] if quiz_result else f"Quiz {quiz_id}"
+            self.quiz_name = quiz_name
+            if quiz_result and len(quiz_result) > 2 and quiz_result[2]:
+                self.creator_username = quiz_result[2]
+            
+            # Look up the results channel now rather than when the quiz ends
+            await self._resolve_channel()
             
             # Send initial message
             try:
-                self.current_message = await self.user.send(
-                    f"Starting quiz: **{quiz_name}**\n\n"
-                    f"This quiz has {len(self.questions)} questions.\n"
-                    f"You will have {self.timer_duration} seconds for each question.\n"
-                    f"Click 'Start Quiz' when you're ready!"
-                )
-                
                 # Create a simple start button
                 view = discord.ui.View(timeout=300)  # 5 minute timeout
                 start_button = discord.ui.Button(label="Start Quiz", style=discord.ButtonStyle.success)
-                
-                async def start_quiz_callback(interaction):
-                    if interaction.user.id != self.user_id:
-                        await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                        return
-                    
-                    await interaction.response.defer()
-                    self.is_running = True
-                    await self.current_message.edit(content="Quiz starting...", view=None)
-                
-                start_button.callback = start_quiz_callback
+                start_button.callback = self._on_start
                 view.add_item(start_button)
                 
-                await self.current_message.edit(view=view)
-                logger.info(f"DM quiz {quiz_id} initialized with {len(self.questions)} questions for user {self.user_id}")
+                # Send the intro together with its button in a single request
+                self.current_message = await self.dm_channel.send(
+                    f"Starting quiz: **{quiz_name}**\n\n"
+                    f"This quiz has {len(self.questions)} questions.\n"
+                    f"You will have {self.timer_duration} seconds for each question.\n"
+                    f"Click 'Start Quiz' when you're ready!",
+                    view=view
+                )
+                logger.info("DM quiz %s initialized with %d questions for user %s", quiz_id, len(self.questions), self.user_id)
                 return True
                 
             except discord.Forbidden:
-                logger.error(f"Cannot send DM to user {self.user_id} - DMs disabled")
+                logger.error("Cannot send DM to user %s - DMs disabled", self.user_id)
                 return False
                 
         except Exception as e:
-            logger.error(f"Failed to initialize quiz: {e}")
+            logger.error("Failed to initialize quiz: %s", e)
             return False
     
+    async def _resolve_channel(self):
+        """Find the channel results are reported to, fetching it if it isn't cached"""
+        channel = self.bot.get_channel(self.channel_id)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(self.channel_id)
+            except discord.HTTPException as e:
+                logger.error("Could not fetch results channel %s: %s", self.channel_id, e)
+        self.channel = channel
+    
     async def run_quiz(self):
         """Run the entire quiz as a background task"""
         # Wait for user to start the quiz
-        while not self.is_running:
-            await asyncio.sleep(1)
+        await self._started.wait()
         
         try:
             # Start showing questions
             for i in range(len(self.questions)):
                 self.current_index = i
+                self._question_done.clear()
                 
                 # Show current question
                 await self.show_question()
                 
                 # Wait for this question to complete before moving to the next one
-                while self.current_index == i and self.is_running:
-                    await asyncio.sleep(0.5)
+                await self._question_done.wait()
                 
                 # If quiz was terminated, break out
                 if not self.is_running:
@@ -185,10 +323,10 @@ class DMQuizView:
             if self.is_running:
                 await self.end_quiz()
         except Exception as e:
-            logger.error(f"Error running quiz: {e}")
+            logger.error("Error running quiz: %s", e)
             try:
-                await self.user.send("Sorry, there was an error running your quiz. Please try again later.")
-            except:
+                await self.dm_channel.send("Sorry, there was an error running your quiz. Please try again later.")
+            except discord.HTTPException:
                 pass
     
     async def show_question(self):
@@ -201,11 +339,9 @@ class DMQuizView:
             # Reset the answered flag for the new question
             self.answered = False
             
-            question_data = self.questions[self.current_index]
-            question_text = question_data[2]
-            options = json.loads(question_data[3])
-            correct_answer = question_data[4]
-            max_score = question_data[5]
+            question = self.questions[self.current_index]
+            question_text = question.text
+            options = question.options
             
             # Create a unique ID for this specific question instance
             question_instance_id = f"{self.quiz_instance_id}_{self.current_index}"
@@ -213,20 +349,18 @@ class DMQuizView:
             # Create a new discord View for this question
             view = discord.ui.View(timeout=self.timer_duration + 5)  # Add a small buffer to timeout
             
-            # Create question embed
-            embed = discord.Embed(
-                title=f"Question {self.current_index + 1}/{len(self.questions)}", 
-                description=question_text, 
-                color=discord.Color.blue()
-            )
-            
-            # Add options as fields
-            for key, value in options.items():
-                embed.add_field(name=key, value=value, inline=False)
-            
-            embed.set_footer(text=f"Time left: {self.timer_duration} seconds ⏳ | Quiz ID: {question_instance_id}")
-            
-            # Add button for each option
+            # Create question embed in one pass from the prebuilt option fields, with the timer in the footer
+            embed = discord.Embed.from_dict({
+                "title": f"Question {self.current_index + 1}/{len(self.questions)}",
+                "description": question_text,
+                "color": QUESTION_COLOR.value,
+                # Embed.from_dict keeps the list it is given and later add_field calls append to it
+                "fields": list(question.fields),
+                "footer": {"text": f"Time limit: {self.timer_duration} seconds ⏳ | Quiz ID: {question_instance_id}"},
+            })
+            
+            # Add button for each option, keeping them so they can be updated in place later
+            self._option_buttons = {}
             for key in options.keys():
                 button = discord.ui.Button(
                     label=key, 
@@ -234,228 +368,236 @@ class DMQuizView:
                     custom_id=f"answer_{question_instance_id}_{key}"
                 )
                 
-                async def make_callback(btn_key):
-                    async def answer_callback(interaction):
-                        # First, verify this is the right user
-                        if interaction.user.id != self.user_id:
-                            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                            return
-                        
-                        # Check if the question has already been answered by extracting the question ID from custom_id
-                        interaction_id_parts = interaction.data.get('custom_id', '').split('_')
-                        if len(interaction_id_parts) >= 3:
-                            # Extract the quiz and question IDs from the custom_id
-                            interaction_quiz_id = '_'.join(interaction_id_parts[1:-1])
-                            if f"{self.quiz_instance_id}_{self.current_index}" != interaction_quiz_id:
-                                await interaction.response.send_message(
-                                    "This question has already been answered or is not active.",
-                                    ephemeral=True
-                                )
-                                return
-                        
-                        # Check if we've already processed an answer for this question
-                        if self.answered:
-                            await interaction.response.send_message(
-                                "You've already answered this question!",
-                                ephemeral=True
-                            )
-                            return
-                            
-                        # Mark as answered immediately to prevent double-clicks
-                        self.answered = True
-                        
-                        # Acknowledge interaction immediately
-                        await interaction.response.defer()
-                        
-                        # Stop the timer
-                        self.is_running = False
-                        
-                        # Process the answer
-                        start_time = time.time() - (self.timer_duration - float(embed.footer.text.split()[2]))
-                        await self.process_answer(
-                            interaction.message,
-                            btn_key,
-                            correct_answer,
-                            max_score,
-                            start_time
-                        )
-                    return answer_callback
-                
-                button.callback = await make_callback(key)
+                button.callback = self._on_answer
+                self._option_buttons[key] = button
                 view.add_item(button)
             
+            # Answer time is measured from here rather than parsed back out of the footer
+            self._question_shown_at = time.monotonic()
+            # Discord renders a relative timestamp as a live countdown on the client, so the timer needs no edits
+            countdown = f"⏳ Time runs out <t:{int(time.time()) + self.timer_duration}:R>"
+            
             # Send/update the message
             if self.current_message:
                 try:
-                    self.current_message = await self.current_message.edit(content=None, embed=embed, view=view)
+                    self.current_message = await self.current_message.edit(content=countdown, embed=embed, view=view)
                 except discord.NotFound:
-                    self.current_message = await self.user.send(embed=embed, view=view)
+                    self.current_message = await self.dm_channel.send(content=countdown, embed=embed, view=view)
             else:
-                self.current_message = await self.user.send(embed=embed, view=view)
+                self.current_message = await self.dm_channel.send(content=countdown, embed=embed, view=view)
             
             # Save the current view for reference
             self.view = view
             
             # Run timer in the background
-            asyncio.create_task(self.run_timer(self.current_message, embed, self.current_index, question_instance_id))
+            self._timer_task = asyncio.create_task(self.run_timer(self.current_message, embed, self.current_index, question_instance_id))
             
         except Exception as e:
-            logger.error(f"Error showing question: {e}")
+            logger.error("Error showing question: %s", e)
             try:
-                await self.user.send(f"Error showing question: {str(e)}")
-            except:
+                await self.dm_channel.send(f"Error showing question: {str(e)}")
+            except discord.HTTPException:
                 pass
     
+    async def _on_start(self, interaction):
+        """Handle a click on the 'Start Quiz' button"""
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        self.is_running = True
+        self._started.set()
+        await self.current_message.edit(content="Quiz starting...", view=None)
+    
+    async def _on_answer(self, interaction):
+        """Handle a click on one of the answer buttons"""
+        # First, verify this is the right user
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        # custom_id is answer_<quiz instance>_<question index>_<option key>
+        custom_id = interaction.data.get('custom_id', '')
+        expected_prefix = f"answer_{self.quiz_instance_id}_{self.current_index}_"
+        chosen_key = custom_id[len(expected_prefix):]
+        if not custom_id.startswith(expected_prefix):
+            await interaction.response.send_message(
+                "This question has already been answered or is not active.",
+                ephemeral=True
+            )
+            return
+        
+        # Check if we've already processed an answer for this question
+        if self.answered:
+            await interaction.response.send_message(
+                "You've already answered this question!",
+                ephemeral=True
+            )
+            return
+            
+        # Measure the answer time at the click, before any awaits
+        time_taken = time.monotonic() - self._question_shown_at
+        
+        # Mark as answered immediately to prevent double-clicks, and stop the question timer
+        self.answered = True
+        self._cancel_timer()
+        
+        # Acknowledge interaction immediately
+        await interaction.response.defer()
+        
+        # Stop the timer
+        self.is_running = False
+        self._question_done.set()
+        
+        # Process the answer
+        question = self.questions[self.current_index]
+        await self.process_answer(
+            interaction.message,
+            chosen_key,
+            question.correct,
+            question.max_score,
+            time_taken
+        )
+    
+    async def _on_next(self, interaction):
+        """Handle a click on the 'Next Question' button"""
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        # Verify this is for the current question
+        if interaction.data.get('custom_id', '') != f"next_{self.quiz_instance_id}_{self.current_index}":
+            await interaction.response.send_message(
+                "This button is no longer active.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        # Move to next question
+        self.is_running = True
+        self.current_index += 1
+        self._question_done.set()
+        asyncio.create_task(self.show_question())
+    
+    async def _on_end(self, interaction):
+        """Handle a click on the 'End Quiz' button"""
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        # Verify this is for the current question
+        if interaction.data.get('custom_id', '') != f"end_{self.quiz_instance_id}_{self.current_index}":
+            await interaction.response.send_message(
+                "This button is no longer active.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        # End the quiz
+        await self.end_quiz()
+    
+    def _build_progression_view(self, embed, question_instance_id, is_last):
+        """Add the Next Question or End Quiz button to the current question's view"""
+        view = self.view
+        # Keep listening for the Next/End click past the question timer
+        view.timeout = PROGRESSION_VIEW_TIMEOUT
+        
+        if is_last:
+            button = discord.ui.Button(
+                label="End Quiz", 
+                style=discord.ButtonStyle.success,
+                custom_id=f"end_{question_instance_id}"
+            )
+            button.callback = self._on_end
+            
+            # Add message about auto-ending
+            embed.add_field(
+                name="Quiz Completion",
+                value="This is the final question. Press 'End Quiz' to see your results. The quiz will automatically end in 60 seconds.",
+                inline=False
+            )
+            self._arm_auto_end()
+        else:
+            button = discord.ui.Button(
+                label="Next Question", 
+                style=discord.ButtonStyle.primary,
+                custom_id=f"next_{question_instance_id}"
+            )
+            button.callback = self._on_next
+        
+        view.add_item(button)
+        return view
+    
+    def _arm_auto_end(self):
+        """Schedule the automatic end of the quiz, unless it is already scheduled"""
+        if not self._auto_end_armed:
+            self._auto_end_armed = True
+            _schedule_auto_end(self, 60)
+    
+    def _cancel_timer(self):
+        """Stop the current question's timer, unless it is the task calling this"""
+        task = self._timer_task
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+    
     async def run_timer(self, message, embed, question_index, question_instance_id):
         """Run a timer for the current question"""
         try:
-            # Set initial time
-            time_left = self.timer_duration
-            
-            # Only run timer while question is active and hasn't been answered
-            while time_left > 0 and self.is_running and self.current_index == question_index and not self.answered:
-                # Update timer every 3 seconds or when time is low
-                if time_left % 3 == 0 or time_left <= 5:
-                    embed.set_footer(text=f"Time left: {time_left} seconds ⏳ | Quiz ID: {question_instance_id}")
-                    try:
-                        await message.edit(embed=embed)
-                    except (discord.NotFound, discord.Forbidden):
-                        # Message was deleted or can't be edited
-                        return
-                
-                await asyncio.sleep(1)
-                time_left -= 1
+            # Sleep until the time limit; answering the question cancels this task
+            try:
+                await asyncio.sleep(self.timer_duration)
+            except asyncio.CancelledError:
+                return
             
-                # If the timer ran out and question is still active, process timeout
-                if time_left <= 0 and self.is_running and self.current_index == question_index and not self.answered:
-                    self.is_running = False
-                    self.answered = True
-                    
-                    # Show timeout message
-                    embed.add_field(
-                        name="Time's up!",
-                        value=f"The correct answer was {self.questions[question_index][4]}",
-                        inline=False
-                    )
-                    
-                    # Disable buttons
-                    if self.view:
-                        for item in self.view.children:
-                            if isinstance(item, discord.ui.Button):
-                                item.disabled = True
-                    
-                    # Check if this is the last question
-                    is_last_question = question_index == len(self.questions) - 1
-                    
-                    if is_last_question:
-                        # Add End Quiz button
-                        next_view = discord.ui.View()
-                        end_button = discord.ui.Button(
-                            label="End Quiz", 
-                            style=discord.ButtonStyle.success,
-                            custom_id=f"end_{question_instance_id}"
-                        )
-                        
-                        async def end_callback(interaction):
-                            if interaction.user.id != self.user_id:
-                                await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                                return
-                            
-                            # Verify this is for the current question
-                            interaction_id = interaction.data.get('custom_id', '').split('_', 1)[1]
-                            if question_instance_id != interaction_id:
-                                await interaction.response.send_message(
-                                    "This button is no longer active.",
-                                    ephemeral=True
-                                )
-                                return
-                            
-                            await interaction.response.defer()
-                            # End the quiz
-                            await self.end_quiz()
-                        
-                        end_button.callback = end_callback
-                        next_view.add_item(end_button)
-                        
-                        # Add message about auto-ending
-                        embed.add_field(
-                            name="Quiz Completion",
-                            value="This is the final question. Press 'End Quiz' to see your results. The quiz will automatically end in 60 seconds.",
-                            inline=False
-                        )
-                        
-                        # Create a task to automatically end the quiz after timeout
-                        self._auto_end_task = asyncio.create_task(self.auto_end_quiz(60))
-                    else:
-                        # Add Next Question button for non-last questions
-                        next_view = discord.ui.View()
-                        next_button = discord.ui.Button(
-                            label="Next Question", 
-                            style=discord.ButtonStyle.primary,
-                            custom_id=f"next_{question_instance_id}"
-                        )
-                        
-                        async def next_callback(interaction):
-                            if interaction.user.id != self.user_id:
-                                await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                                return
-                            
-                            # Verify this is for the current question
-                            interaction_id = interaction.data.get('custom_id', '').split('_', 1)[1]
-                            if question_instance_id != interaction_id:
-                                await interaction.response.send_message(
-                                    "This button is no longer active.",
-                                    ephemeral=True
-                                )
-                                return
-                            
-                            await interaction.response.defer()
-                            # Move to next question
-                            self.is_running = True
-                            self.current_index += 1
-                            # Add this line to explicitly trigger the next question
-                            asyncio.create_task(self.show_question())
-                        
-                        next_button.callback = next_callback
-                        next_view.add_item(next_button)
-                    
-                    try:
-                        await message.edit(embed=embed, view=next_view)
-                    except (discord.NotFound, discord.Forbidden):
-                        pass
+            if not self.is_running or self.current_index != question_index or self.answered:
+                return
+            
+            # The timer ran out while the question was still active, so process the timeout
+            self.is_running = False
+            self.answered = True
+            self._question_done.set()
+            
+            # Show timeout message
+            embed.add_field(
+                name="Time's up!",
+                value=f"The correct answer was {self.questions[question_index].correct}",
+                inline=False
+            )
+            
+            # Disable buttons and show the Next/End button
+            for button in self._option_buttons.values():
+                button.disabled = True
+            next_view = self._build_progression_view(embed, question_instance_id, question_index == self._last_index)
+            
+            try:
+                await message.edit(content=None, embed=embed, view=next_view)
+            except (discord.NotFound, discord.Forbidden):
+                pass
             
         except Exception as e:
-            logger.error(f"Error in timer: {e}")
+            logger.error("Error in timer: %s", e)
         
-    async def process_answer(self, message, chosen_answer, correct_answer, max_score, start_time):
-        """Process a user's answer"""
+    async def process_answer(self, message, chosen_answer, correct_answer, max_score, time_taken):
+        """Process a user's answer, given the seconds it took them to answer"""
         try:
-            # Calculate time taken
-            time_taken = time.time() - start_time
-            time_ratio = max(0, 1 - (time_taken / self.timer_duration))
+            time_ratio = max(0, 1 - time_taken * self._inv_timer)
             
             # Get the current embed
             embed = message.embeds[0].copy()
             
-            # Get the question instance ID from the footer
-            footer_text = embed.footer.text
-            question_instance_id = footer_text.split(" | Quiz ID: ")[1] if " | Quiz ID: " in footer_text else self.quiz_instance_id
-            
-            # Create new view with disabled buttons
-            new_view = discord.ui.View()
-            
-            # Add buttons matching the original options but disabled
-            for child in self.view.children:
-                if isinstance(child, discord.ui.Button) and child.custom_id and child.custom_id.startswith("answer_"):
-                    key = child.label
-                    button = discord.ui.Button(
-                        label=key, 
-                        style=discord.ButtonStyle.primary if key != chosen_answer and key != correct_answer else
-                            discord.ButtonStyle.success if key == correct_answer else
-                            discord.ButtonStyle.danger,
-                        disabled=True
-                    )
-                    new_view.add_item(button)
+            # Rebuild the question instance ID rather than parsing it back out of the footer
+            question_instance_id = f"{self.quiz_instance_id}_{self.current_index}"
+            
+            # Disable the question's buttons in place, highlighting the chosen and correct answers
+            for key, button in self._option_buttons.items():
+                button.disabled = True
+                if key == correct_answer:
+                    button.style = discord.ButtonStyle.success
+                elif key == chosen_answer:
+                    button.style = discord.ButtonStyle.danger
             
             # Check if the answer is correct
             is_correct = chosen_answer == correct_answer
@@ -480,126 +622,57 @@ class DMQuizView:
                 )
                 
                 # Add explanation if available
-                if len(self.questions[self.current_index]) > 6 and self.questions[self.current_index][6]:  # Check if explanation exists
+                explanation = self.questions[self.current_index].explanation
+                if explanation:  # Check if explanation exists
                     embed.add_field(
                         name="Explanation",
-                        value=self.questions[self.current_index][6],
+                        value=explanation,
                         inline=False
                     )
             
-            # Check if this is the last question
-            is_last_question = self.current_index == len(self.questions) - 1
-            
-            if is_last_question:
-                # Add End Quiz button for the last question
-                end_button = discord.ui.Button(
-                    label="End Quiz", 
-                    style=discord.ButtonStyle.success,
-                    custom_id=f"end_{question_instance_id}"
-                )
-                
-                async def end_callback(interaction):
-                    if interaction.user.id != self.user_id:
-                        await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                        return
-                    
-                    # Verify this is for the current question
-                    interaction_id = interaction.data.get('custom_id', '').split('_', 1)[1]
-                    if question_instance_id != interaction_id:
-                        await interaction.response.send_message(
-                            "This button is no longer active.",
-                            ephemeral=True
-                        )
-                        return
-                    
-                    await interaction.response.defer()
-                    # End the quiz
-                    await self.end_quiz()
-                
-                end_button.callback = end_callback
-                new_view.add_item(end_button)
-                
-                # Set timeout to automatically end the quiz after 60 seconds
-                embed.add_field(
-                    name="Quiz Completion",
-                    value="This is the final question. Press 'End Quiz' to see your results. The quiz will automatically end in 60 seconds.",
-                    inline=False
-                )
-                
-                # Create a task to automatically end the quiz after timeout
-                self._auto_end_task = asyncio.create_task(self.auto_end_quiz(60))
-                
-            else:
-                # Add next button for non-last questions
-                next_button = discord.ui.Button(
-                    label="Next Question", 
-                    style=discord.ButtonStyle.primary,
-                    custom_id=f"next_{question_instance_id}"
-                )
-                
-                async def next_callback(interaction):
-                    if interaction.user.id != self.user_id:
-                        await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                        return
-                    
-                    # Verify this is for the current question
-                    interaction_id = interaction.data.get('custom_id', '').split('_', 1)[1]
-                    if question_instance_id != interaction_id:
-                        await interaction.response.send_message(
-                            "This button is no longer active.",
-                            ephemeral=True
-                        )
-                        return
-                    
-                    await interaction.response.defer()
-                    # Move to next question
-                    self.is_running = True
-                    self.current_index += 1
-                    # Add this line to explicitly trigger the next question
-                    asyncio.create_task(self.show_question())
-                
-                next_button.callback = next_callback
-                new_view.add_item(next_button)
+            # Add the Next/End button
+            new_view = self._build_progression_view(embed, question_instance_id, self.current_index == self._last_index)
                     
             # Update the message
             try:
-                await message.edit(embed=embed, view=new_view)
+                await message.edit(content=None, embed=embed, view=new_view)
             except (discord.NotFound, discord.Forbidden):
                 # Try sending a new message if edit fails
-                await self.user.send("Your previous question couldn't be updated. Here's the result:", embed=embed, view=new_view)
+                await self.dm_channel.send("Your previous question couldn't be updated. Here's the result:", embed=embed, view=new_view)
             
         except Exception as e:
-            logger.error(f"Error processing answer: {e}")
+            logger.error("Error processing answer: %s", e)
             try:
                 # Send a new message as fallback
-                await self.user.send(f"There was an error processing your answer, but we've recorded it. Moving to the next question.")
+                await self.dm_channel.send(f"There was an error processing your answer, but we've recorded it. Moving to the next question.")
                 self.is_running = True
                 self.current_index += 1
-            except:
+            except discord.HTTPException:
                 pass
     
-    async def end_quiz(self):
-        """End the quiz and show results"""
+    async def end_quiz(self, auto_ended=False):
+        """End the quiz and show results, noting in the results when it ended due to inactivity"""
+        # Set flag to indicate quiz is finished to prevent other processes from interfering
+        self.is_running = False
+        self._question_done.set()
+        self._cancel_timer()
+        
+        # Check if we've already ended this quiz. There is no await between this check and
+        # setting the flag, so only the first caller gets past it and the score is written once
+        if self._quiz_ended:
+            logger.info("Quiz %s has already ended, ignoring duplicate end call", self.quiz_instance_id)
+            return
+        
+        # Mark quiz as ended immediately to prevent race conditions
+        self._quiz_ended = True
+        logger.info("Marked quiz %s as ended", self.quiz_instance_id)
+        
+        # Hand the score to the batch writer so results aren't held up by the write
+        queue_user_score(self.user_id, self.user_name, self.quiz_id, self.score)
+        logger.info("Queued score for %s: %s points in quiz %s", self.user_name, self.score, self.quiz_id)
+        
         try:
-            # Set flag to indicate quiz is finished to prevent other processes from interfering
-            self.is_running = False
-            
-            # Check if we've already ended this quiz
-            if hasattr(self, '_quiz_ended') and self._quiz_ended:
-                logger.info(f"Quiz {self.quiz_instance_id} has already ended, ignoring duplicate end call")
-                return
-            
-            # Mark quiz as ended immediately to prevent race conditions
-            self._quiz_ended = True
-            logger.info(f"Marked quiz {self.quiz_instance_id} as ended")
-            
-            # Cancel any pending auto-end timer
-            if hasattr(self, '_auto_end_task') and self._auto_end_task:
-                self._auto_end_task.cancel()
-                self._auto_end_task = None
-                logger.info(f"Cancelled auto-end task for quiz {self.quiz_instance_id}")
-            
-            logger.info(f"Ending quiz {self.quiz_instance_id} for user {self.user_id}")
+            logger.info("Ending quiz %s for user %s", self.quiz_instance_id, self.user_id)
             
             # First, update the last question message if it exists
             if self.current_message:
@@ -608,147 +681,100 @@ class DMQuizView:
                     clean_embed = discord.Embed(
                         title="Quiz Complete",
                         description="Thank you for participating in this quiz! Your results are below.",
-                        color=discord.Color.green()
+                        color=COMPLETE_COLOR
                     )
                     
                     # Update the message with the clean embed and no buttons
                     await self.current_message.edit(embed=clean_embed, view=None)
                     
-                    logger.info(f"Updated final question message for user {self.user_id}")
-                except Exception as e:
-                    logger.error(f"Failed to update last question message: {e}")
-            
-            # Get quiz details
-            quiz_result = await get_quiz_name(self.quiz_id)
-            quiz_name = quiz_result[0] if quiz_result else f"Quiz {self.quiz_id}"
-            creator_username = quiz_result[2] if quiz_result and len(quiz_result) > 2 and quiz_result[2] else "Unknown"
-            
-            # Create results embed for DM
-            dm_embed = discord.Embed(
-                title="Quiz Results",
-                description=f"You've completed: {quiz_name}",
-                color=discord.Color.gold()
-            )
-            
-            dm_embed.add_field(
-                name="Your Score",
-                value=f"**{self.score}** points",
-                inline=False
-            )
-            
-            total_questions = len(self.questions)
-            dm_embed.add_field(
-                name="Questions",
-                value=f"Completed {total_questions} questions",
-                inline=False
-            )
-            
-            # Add creator info
-            dm_embed.add_field(
-                name="Quiz Creator",
-                value=creator_username,
-                inline=False
-            )
-            
-            # Add instance ID to track this specific quiz
-            dm_embed.set_footer(text=f"Quiz ID: {self.quiz_instance_id}")
-            
-            # Send DM results
-            try:
-                await self.user.send(content="Quiz finished!", embed=dm_embed)
-            except Exception as e:
-                logger.error(f"Failed to send final results DM: {e}")
-            
-            # Now send results to the server channel
-            try:
-                channel = self.bot.get_channel(self.channel_id)
-                if channel:
-                    server_embed = discord.Embed(
-                        title="Quiz Completed",
-                        description=f"{self.user.mention} has completed: **{quiz_name}**",
-                        color=discord.Color.gold()
-                    )
-                    
-                    server_embed.add_field(
-                        name="Score",
-                        value=f"**{self.score}** points",
-                        inline=True
-                    )
-                    
-                    server_embed.add_field(
-                        name="Questions",
-                        value=f"Completed {total_questions} questions",
-                        inline=True
-                    )
-                    
-                    server_embed.add_field(
-                        name="Created by",
-                        value=creator_username,
-                        inline=True
-                    )
-                    
-                    await channel.send(embed=server_embed)
-                    logger.info(f"Reported quiz results for {self.user_name} to channel {self.channel_id}")
-            except Exception as e:
-                logger.error(f"Error reporting quiz results to channel: {e}")
+                    logger.info("Updated final question message for user %s", self.user_id)
+                except discord.HTTPException as e:
+                    logger.error("Failed to update last question message: %s", e)
+            
+            # Get quiz details, reusing what initialize already resolved
+            quiz_name = self.quiz_name or f"Quiz {self.quiz_id}"
+            creator_username = self.creator_username
+            
+            # Format the values shared by the DM and server embeds once
+            score_str = f"**{self.score}** points"
+            questions_str = f"Completed {len(self.questions)} questions"
+            
+            # Create results embed for DM, tagged with the instance ID to track this specific quiz
+            dm_embed = discord.Embed.from_dict({
+                "title": "Quiz Results",
+                "description": (
+                    f"The quiz has automatically ended due to inactivity.\nYou've completed: {quiz_name}"
+                    if auto_ended else f"You've completed: {quiz_name}"
+                ),
+                "color": RESULTS_COLOR.value,
+                "fields": [
+                    {"name": "Your Score", "value": score_str, "inline": False},
+                    {"name": "Questions", "value": questions_str, "inline": False},
+                    {"name": "Quiz Creator", "value": creator_username, "inline": False},
+                ],
+                "footer": {"text": f"Quiz ID: {self.quiz_instance_id}"},
+            })
+            
+            # Send the DM and the server report concurrently; the score is already being recorded
+            sends = [_send_limited(self.dm_channel.send(embed=dm_embed))]
+            channel = self.channel
+            # Skip the report when cached permissions say it would be rejected anyway
+            if channel and getattr(channel, 'guild', None):
+                perms = channel.permissions_for(channel.guild.me)
+                if not (perms.send_messages and perms.embed_links):
+                    logger.warning("Missing permission to report quiz results in channel %s", self.channel_id)
+                    channel = None
+            if channel:
+                server_embed = discord.Embed.from_dict({
+                    "title": "Quiz Completed",
+                    "description": f"{self.user.mention} has completed: **{quiz_name}**",
+                    "color": RESULTS_COLOR.value,
+                    "fields": [
+                        {"name": "Score", "value": score_str, "inline": True},
+                        {"name": "Questions", "value": questions_str, "inline": True},
+                        {"name": "Created by", "value": creator_username, "inline": True},
+                    ],
+                })
+                sends.append(_send_limited(channel.send(embed=server_embed)))
+            
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            # Only transport failures are expected here; anything else is a bug and should surface
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(result, discord.HTTPException):
+                    raise result
+            if isinstance(results[0], Exception):
+                logger.error("Failed to send final results DM: %s", results[0])
+            if len(results) > 1:
+                if isinstance(results[1], Exception):
+                    logger.error("Error reporting quiz results to channel: %s", results[1])
+                else:
+                    logger.info("Reported quiz results for %s to channel %s", self.user_name, self.channel_id)
         
-            # Record score in database
-            try:
-                username = self.user_name
-                await record_user_score(self.user_id, username, self.quiz_id, self.score)
-                logger.info(f"Recorded score for {username}: {self.score} points in quiz {self.quiz_id}")
-            except Exception as e:
-                logger.error(f"Error recording quiz score: {e}")
-                
         except Exception as e:
-            logger.error(f"Error ending quiz: {e}")
-            # Even if there was an error, we should try to record the score
-            try:
-                await record_user_score(self.user_id, self.user_name, self.quiz_id, self.score)
-                logger.info(f"Recorded score after error for {self.user_name}: {self.score} points in quiz {self.quiz_id}")
-            except:
-                pass
+            logger.error("Error ending quiz: %s", e)
 
     async def auto_end_quiz(self, timeout_seconds):
-        """Automatically end the quiz after a timeout period if not ended by user"""
+        """End the quiz once its auto-end timeout has passed, if the user hasn't ended it"""
         try:
-            # Immediately check if the quiz has already been ended manually
-            if hasattr(self, '_quiz_ended') and self._quiz_ended:
-                logger.info(f"Quiz {self.quiz_instance_id} was already manually ended, skipping auto-end")
-                return
-                
-            # Wait for the specified timeout period
-            await asyncio.sleep(timeout_seconds)
-            
-            # Check again if the quiz has already been ended manually
-            if hasattr(self, '_quiz_ended') and self._quiz_ended:
-                logger.info(f"Quiz {self.quiz_instance_id} was manually ended during wait period, skipping auto-end")
+            # A pending auto-end is simply ignored once the quiz has been ended manually
+            if self._quiz_ended:
+                logger.info("Quiz %s was already manually ended, skipping auto-end", self.quiz_instance_id)
                 return
             
             # Check if we're still on the last question
-            if self.current_index == len(self.questions) - 1:
-                logger.info(f"Auto-ending quiz for user {self.user_id} after {timeout_seconds} second timeout")
+            if self.current_index == self._last_index:
+                logger.info("Auto-ending quiz for user %s after %s second timeout", self.user_id, timeout_seconds)
                 
                 # Force the quiz to end by setting running to false
                 self.is_running = False
                 
-                # Send a message to the user
-                try:
-                    await self.user.send("The quiz has automatically ended due to inactivity. Here are your results:")
-                except:
-                    logger.error(f"Failed to send auto-end message to user {self.user_id}")
-                    
-                # Directly call end_quiz without any further conditions
-                await self.end_quiz()
-        except asyncio.CancelledError:
-            # Task was cancelled, just exit silently
-            logger.debug(f"Auto-end task was cancelled for quiz {self.quiz_instance_id}")
-            return
+                # Directly call end_quiz without any further conditions; the results say why it ended
+                await self.end_quiz(auto_ended=True)
         except Exception as e:
-            logger.error(f"Error in auto_end_quiz: {e}")
+            logger.error("Error in auto_end_quiz: %s", e)
             # Try to force end the quiz even if there was an error
             try:
                 self.is_running = False
                 await self.end_quiz()
             except Exception as inner_e:
-                logger.error(f"Failed to force end quiz after error: {inner_e}")
\ No newline at end of file
+                logger.error("Failed to force end quiz after error: %s", inner_e)
\ No newline at end of file
@@ -4,112 +4,157 @@ from discord import app_commands
 import logging
 import asyncio
 import time
-import json
-import random
-import string
-from collections import deque
+import math
+import itertools
+from collections import OrderedDict
 from config import CONFIG
-from utils.db_utilsv2 import get_quiz_questions, record_user_score, get_quiz_name
+from models.quiz_question import QuizQuestion
+from utils.db_utilsv2 import get_quiz_questions, queue_user_score, get_quiz_name
 import sys
 from utils.analytics import quiz_analytics
 
 logger = logging.getLogger('badgey.solo_quiz_ephemeral')
 
+# Source of process-unique quiz instance IDs, shown in embed footers
+_quiz_instance_ids = itertools.count(1)
+
+# Embed colors, as the raw values Embed.from_dict expects
+QUESTION_COLOR = discord.Color.blue().value
+RESULTS_COLOR = discord.Color.gold().value
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-run
+_background_tasks = set()
+
 # Rate limiting and queuing system
 class QuizQueue:
     """Manages quiz requests and enforces rate limiting"""
     def __init__(self, max_concurrent=5, cooldown_seconds=30):
-        self.active_quizzes = {}  # user_id -> quiz_instance
-        self.queue = deque()  # Queue of pending quiz requests
+        self.active_quizzes = {}  # user_id -> quiz_instance, or None while queued or starting
+        self.queue = asyncio.Queue()  # Queue of pending quiz requests
         self.max_concurrent = max_concurrent
         self.cooldown_seconds = cooldown_seconds
-        self.user_cooldowns = {}  # user_id -> timestamp when cooldown expires
-        self.lock = asyncio.Lock()
+        # user_id -> monotonic time the cooldown expires, oldest first since every cooldown is the same length
+        self.user_cooldowns = OrderedDict()
+        self._workers = []  # One worker per concurrent quiz, started on first use
+    
+    def _evict_expired(self, current_time):
+        """Drop cooldown entries whose expiry has passed, so the dict doesn't grow without bound"""
+        while self.user_cooldowns:
+            user_id, expiry = next(iter(self.user_cooldowns.items()))
+            if expiry > current_time:
+                break
+            del self.user_cooldowns[user_id]
+    
+    def _ensure_workers(self):
+        """Start the worker pool if it isn't running"""
+        if not self._workers or any(worker.done() for worker in self._workers):
+            for worker in self._workers:
+                worker.cancel()
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent)]
     
     async def add_request(self, user_id, interaction, quiz_id, timer, user_name=None):
         """Add a quiz request to the queue"""
-        async with self.lock:
-            # Check if user is on cooldown
-            if user_id in self.user_cooldowns and self.user_cooldowns[user_id] > time.time():
-                remaining = int(self.user_cooldowns[user_id] - time.time())
-                await interaction.response.send_message(
-                    f"Please wait {remaining} seconds before starting another quiz.", 
-                    ephemeral=True
-                )
-                return False
-            
-            # Check if user already has an active quiz
-            if user_id in self.active_quizzes:
-                await interaction.response.send_message(
-                    "You already have an active quiz. Please finish it before starting a new one.",
-                    ephemeral=True
-                )
-                return False
-            
-            # Queue the request
-            request = {
-                'user_id': user_id,
-                'interaction': interaction,
-                'quiz_id': quiz_id,
-                'timer': timer,
-                'user_name': user_name
-            }
-            
-            self.queue.append(request)
-            
-            # If interaction hasn't been responded to yet
+        # Checking and reserving the user happen without an await in between, so no lock is needed
+        reply = None
+        now = time.monotonic()
+        self._evict_expired(now)
+        # Check if user is on cooldown
+        if user_id in self.user_cooldowns:
+            remaining = int(self.user_cooldowns[user_id] - now)
+            reply = f"Please wait {remaining} seconds before starting another quiz."
+        # Check if user already has an active or queued quiz
+        elif user_id in self.active_quizzes:
+            reply = "You already have an active quiz. Please finish it before starting a new one."
+        else:
+            self.active_quizzes[user_id] = None  # Placeholder until the quiz is initialized
+        
+        if reply:
+            # /quiz defers before its own database checks, so the reply usually has to be a followup
+            if interaction.response.is_done():
+                await interaction.followup.send(reply, ephemeral=True)
+            else:
+                await interaction.response.send_message(reply, ephemeral=True)
+            return False
+        
+        # If interaction hasn't been responded to yet (the usual /quiz path has already deferred)
+        try:
             if not interaction.response.is_done():
                 await interaction.response.defer(ephemeral=True, thinking=True)
-            
-            # Process the queue
-            asyncio.create_task(self.process_queue())
-            return True
+        except Exception:
+            self.active_quizzes.pop(user_id, None)
+            raise
+        
+        # Queue the request once deferred, so its quiz can use the followup webhook
+        self._ensure_workers()
+        self.queue.put_nowait({
+            'user_id': user_id,
+            'interaction': interaction,
+            'quiz_id': quiz_id,
+            'timer': timer,
+            'user_name': user_name
+        })
+        return True
     
-    async def process_queue(self):
-        """Process queued quiz requests"""
-        async with self.lock:
-            # Check if we can start more quizzes
-            while len(self.active_quizzes) < self.max_concurrent and self.queue:
-                # Get the next request
-                request = self.queue.popleft()
-                
-                # Create and start the quiz
-                quiz_view = EphemeralQuizView(
-                    request['user_id'],
-                    request['interaction'],
-                    request['quiz_id'],
-                    request['timer'],
-                    request['user_name']
-                )
-                
-                # Initialize the quiz
-                success = await quiz_view.initialize(request['quiz_id'])
-                if success:
-                    self.active_quizzes[request['user_id']] = quiz_view
-                    asyncio.create_task(quiz_view.show_question())
-                    logger.info(f"Started quiz for user {request['user_id']} (Active quizzes: {len(self.active_quizzes)})")
-                else:
-                    # If initialization failed, inform the user
-                    try:
-                        await request['interaction'].followup.send(
-                            "Failed to start the quiz. Please try again later.",
-                            ephemeral=True
-                        )
-                    except Exception as e:
-                        logger.error(f"Error sending failure message: {e}")
+    async def _worker(self):
+        """Run queued quizzes one at a time; max_concurrent workers bound the quizzes in progress"""
+        while True:
+            request = await self.queue.get()
+            try:
+                await self._run_quiz(request)
+            except Exception as e:
+                logger.error(f"Error running quiz for user {request['user_id']}: {e}")
+                self.active_quizzes.pop(request['user_id'], None)
+            finally:
+                self.queue.task_done()
+    
+    async def _run_quiz(self, request):
+        """Start a queued quiz and wait for it to finish"""
+        user_id = request['user_id']
+        quiz_view = EphemeralQuizView(
+            user_id,
+            request['interaction'],
+            request['quiz_id'],
+            request['timer'],
+            request['user_name']
+        )
+        
+        if not await quiz_view.initialize(request['quiz_id']):
+            self.active_quizzes.pop(user_id, None)
+            await self._report_failed_start(request['interaction'])
+            return
+        
+        self.active_quizzes[user_id] = quiz_view
+        logger.info(f"Started quiz for user {user_id} (Active quizzes: {len(self.active_quizzes)})")
+        await quiz_view.show_question()
+        
+        # Hold this worker until the quiz is finished, so at most max_concurrent run at once
+        await quiz_view.finished.wait()
+    
+    async def _report_failed_start(self, interaction):
+        """Tell the user their quiz couldn't be initialized"""
+        try:
+            await interaction.followup.send(
+                "Failed to start the quiz. Please try again later.",
+                ephemeral=True
+            )
+        except Exception as e:
+            logger.error(f"Error sending failure message: {e}")
     
     async def finish_quiz(self, user_id):
         """Mark a quiz as completed and apply cooldown"""
-        async with self.lock:
-            if user_id in self.active_quizzes:
-                del self.active_quizzes[user_id]
-                
-                # Apply cooldown
-                self.user_cooldowns[user_id] = time.time() + self.cooldown_seconds
-                logger.info(f"User {user_id} finished quiz. Cooldown applied for {self.cooldown_seconds} seconds")
-                
-                # Process queue again in case there are waiting requests
-                asyncio.create_task(self.process_queue())
+        if user_id in self.active_quizzes:
+            quiz_view = self.active_quizzes.pop(user_id)
+            
+            # Apply cooldown
+            now = time.monotonic()
+            self._evict_expired(now)
+            self.user_cooldowns[user_id] = now + self.cooldown_seconds
+            self.user_cooldowns.move_to_end(user_id)
+            logger.info(f"User {user_id} finished quiz. Cooldown applied for {self.cooldown_seconds} seconds")
+            
+            # Free the quiz's worker for the next waiting request
+            if quiz_view is not None:
+                quiz_view.finished.set()
 
 # Global quiz queue instance
 quiz_queue = QuizQueue()
@@ -125,11 +170,19 @@ class EphemeralQuizView(discord.ui.View):
         self.index = 0
         self.interaction = interaction
         self.questions = []
+        self._last_index = -1  # Index of the final question, set once the questions are loaded
         self.timer_task = timer
+        self._inv_timer = 1.0 / timer if timer else 0.0  # Scales answer time into the time penalty
         self.lock = asyncio.Lock()
         self.start_time = None
         self.current_timer = None
-        self.auto_end_timer = None  # Added for auto-ending quiz
+        self.auto_end_timer = None  # Handle of the scheduled auto-end, from loop.call_later
+        self._answered = asyncio.Event()  # Set when the current question is answered, stops its timer
+        self.finished = asyncio.Event()  # Set by the queue once the quiz is finished, frees its worker
+        self._answer_buttons = []  # Answer buttons, reused from question to question
+        self._progress_button = discord.ui.Button(label="Next Question", style=discord.ButtonStyle.primary)
+        self._progress_button.callback = self._on_progress
+        self._score_recorded = False  # Set once the score is queued and the quiz slot freed
         self.transitioning = False
         self.latest_response = None  # Store the latest interaction response
         self.message_id = self._generate_message_id()  # Unique message ID for this quiz instance
@@ -137,6 +190,8 @@ class EphemeralQuizView(discord.ui.View):
         self.max_retries = 3  # Maximum number of retries for operations
         self.quiz_start_time = time.time()  # Track when the quiz started
         self._is_ended = False  # Flag to track if quiz has ended
+        self.quiz_name = f"Quiz {quiz_id}"  # Quiz details, resolved once in initialize
+        self.creator_username = "Unknown"
         
         # Record quiz start in analytics
         asyncio.create_task(self._record_quiz_start())
@@ -165,8 +220,8 @@ class EphemeralQuizView(discord.ui.View):
                 logger.error(f"Error canceling current timer: {e}")
         self.current_timer = None
         
-        # Cancel auto-end timer
-        if self.auto_end_timer and not self.auto_end_timer.done():
+        # Cancel auto-end timer (cancelling a handle that already fired is harmless)
+        if self.auto_end_timer:
             try:
                 self.auto_end_timer.cancel()
                 logger.debug(f"Canceled auto-end timer for user {self.user_id}")
@@ -176,9 +231,7 @@ class EphemeralQuizView(discord.ui.View):
 
     def _generate_message_id(self):
         """Generate a unique message ID for this quiz instance"""
-        timestamp = int(time.time())
-        random_part = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-        return f"quiz-{self.user_id}-{timestamp}-{random_part}"
+        return f"quiz-{self.user_id}-{next(_quiz_instance_ids):x}"
 
     async def initialize(self, quiz_id):
         """Initialize the quiz by loading questions with retry logic"""
@@ -187,15 +240,24 @@ class EphemeralQuizView(discord.ui.View):
         retries = 0
         while retries < self.max_retries:
             try:
-                self.questions = await get_quiz_questions(quiz_id)
+                # Parse each question up front rather than on every display
+                self.questions = [QuizQuestion.from_row(row) for row in await get_quiz_questions(quiz_id)]
                 if not self.questions:
                     logger.error(f"No questions found for quiz {quiz_id}")
                     return False
+                self._last_index = len(self.questions) - 1
                 
                 self.quiz_id = quiz_id
                 self.score = 0
                 self.index = 0
                 
+                # Resolve the quiz details now so ending the quiz doesn't have to look them up
+                quiz_result = await get_quiz_name(quiz_id)
+                if quiz_result:
+                    self.quiz_name = quiz_result[0]
+                    if len(quiz_result) > 2 and quiz_result[2]:
+                        self.creator_username = quiz_result[2]
+                
                 logger.info(f"Ephemeral quiz {quiz_id} initialized with {len(self.questions)} questions for user {self.user_id}")
                 return True
             
@@ -230,9 +292,9 @@ class EphemeralQuizView(discord.ui.View):
 
             try:
                 # Get question details
-                question_data = self.questions[self.index]
-                correct_answer = question_data[4]
-                explanation = question_data[6]
+                question = self.questions[self.index]
+                correct_answer = question.correct
+                explanation = question.explanation
 
                 # Create feedback embed
                 feedback_embed = discord.Embed(
@@ -243,19 +305,10 @@ class EphemeralQuizView(discord.ui.View):
                 if explanation:
                     feedback_embed.add_field(name="Explanation", value=explanation, inline=False)
 
-                # Disable buttons (create a new view with disabled buttons)
-                timed_out_view = discord.ui.View(timeout=None)
-                for item in message.components:
-                    if isinstance(item, discord.ui.ActionRow):
-                        for component in item.children:
-                            if isinstance(component, discord.ui.Button):
-                                disabled_button = discord.ui.Button(
-                                    label=component.label,
-                                    style=component.style,
-                                    custom_id=component.custom_id,
-                                    disabled=True
-                                )
-                                timed_out_view.add_item(disabled_button)
+                # Disable the answer buttons in place; every item in the view is a button
+                for child in self.children:
+                    child.disabled = True
+                timed_out_view = self
 
                 # Edit the original message
                 if self.latest_response:
@@ -291,16 +344,29 @@ class EphemeralQuizView(discord.ui.View):
             finally:
                 self.transitioning = False
 
-    async def end_quiz(self):
-        """End the quiz and show results"""
+    def _results_embed(self, title, description, creator_username):
+        """Build a quiz results embed with the score, question count and creator fields"""
+        return discord.Embed.from_dict({
+            "title": title,
+            "description": description,
+            "color": RESULTS_COLOR,
+            "fields": [
+                {"name": "Score", "value": f"**{self.score}** points", "inline": True},
+                {"name": "Questions", "value": f"Completed {len(self.questions)} questions", "inline": True},
+                {"name": "Quiz Creator", "value": str(creator_username), "inline": True},
+            ],
+        })
+
+    async def end_quiz(self, thank_you_embed=None):
+        """End the quiz and show results, replacing the last question with thank_you_embed if given"""
         try:
             # Prevent duplicate endings
             if self._is_ended:
-                logger.debug(f"Quiz already ended for user {self.user_id}")
+                logger.debug("Quiz already ended for user %s", self.user_id)
                 return
             self._is_ended = True
-                
-            # Cancel auto-end timer if it exists
+            
+            # Cancel the scheduled auto-end; once it has fired this is a no-op
             if self.auto_end_timer:
                 self.auto_end_timer.cancel()
                 self.auto_end_timer = None
@@ -323,205 +389,164 @@ class EphemeralQuizView(discord.ui.View):
                     self.score
                 )
             except Exception as e:
-                logger.error(f"Error recording quiz completion: {e}")
+                logger.error("Error recording quiz completion: %s", e)
             
-            # Get quiz details with retry logic
-            quiz_name = f"Quiz {self.quiz_id}"  # Default name
-            creator_username = "Unknown"
-            retries = 0
-            while retries < self.max_retries:
-                try:
-                    quiz_result = await get_quiz_name(self.quiz_id)
-                    if quiz_result:
-                        quiz_name = quiz_result[0]
-                        creator_username = quiz_result[2] if len(quiz_result) > 2 and quiz_result[2] else "Unknown"
-                    break
-                except Exception as e:
-                    retries += 1
-                    logger.warning(f"Error getting quiz name (attempt {retries}/{self.max_retries}): {e}")
-                    await asyncio.sleep(2 ** retries)
+            # Quiz details were resolved when the quiz was initialized
+            quiz_name = self.quiz_name
+            creator_username = self.creator_username
             
             # Create results embed
-            embed = discord.Embed(
-                title="Quiz Results",
-                description=f"completed: {quiz_name}",
-                color=discord.Color.gold()
-            )
-            
-            embed.add_field(
-                name="Score",
-                value=f"**{self.score}** points",
-                inline=True
-            )
-            
-            total_questions = len(self.questions)
-            embed.add_field(
-                name="Questions",
-                value=f"Completed {total_questions} questions",
-                inline=True
-            )
-            
-            # Add creator info
-            embed.add_field(
-                name="Quiz Creator",
-                value=creator_username,
-                inline=True
-            )
+            embed = self._results_embed("Quiz Results", f"completed: {quiz_name}", creator_username)
             
             # Add unique identifier to footer
             embed.set_footer(text=f"Quiz ID: {self.message_id}")
             
             # Update the last question with a thank you message
-            thank_you_embed = discord.Embed(
-                title="Thank You for Participating!",
-                description=f"You've completed the quiz '{quiz_name}'. Your results are being sent to the channel.",
-                color=discord.Color.green()
-            )
-            
-            # Create an empty view with no buttons to replace the current view
-            empty_view = discord.ui.View()
-            
-            # Edit the question message with the thank you message and no buttons
-            retries = 0
-            while retries < self.max_retries:
-                try:
-                    if self.latest_response:
-                        await self.latest_response.edit(content=None, embed=thank_you_embed, view=empty_view)
-                    break
-                except discord.errors.NotFound:
-                    logger.warning(f"Message not found when sending thank you message.")
-                    break
-                except Exception as e:
-                    retries += 1
-                    logger.warning(f"Error sending thank you message (attempt {retries}/{self.max_retries}): {e}")
-                    if retries >= self.max_retries:
-                        logger.error(f"Failed to send thank you message after {self.max_retries} attempts")
-                    await asyncio.sleep(2 ** retries)
+            if thank_you_embed is None:
+                thank_you_embed = discord.Embed(
+                    title="Thank You for Participating!",
+                    description=f"You've completed the quiz '{quiz_name}'. Your results are being sent to the channel.",
+                    color=discord.Color.green()
+                )
             
             # Send public results in the channel (non-ephemeral)
             # Create a public results embed
-            public_embed = discord.Embed(
-                title="Quiz Completed",
-                description=f"<@{self.user_id}> completed: {quiz_name}",
-                color=discord.Color.gold()
-            )
-            
-            public_embed.add_field(
-                name="Score",
-                value=f"**{self.score}** points",
-                inline=True
-            )
-                        
-            public_embed.add_field(
-                name="Questions",
-                value=f"Completed {total_questions} questions",
-                inline=True
-            )
-            
-            # Add creator info to public results
-            public_embed.add_field(
-                name="Quiz Creator",
-                value=creator_username,
-                inline=True
-            )
-            
-            # Send public results to the channel
-            retries = 0
-            while retries < self.max_retries:
-                try:
-                    await self.interaction.channel.send(
-                        embed=public_embed
-                    )
-                    logger.info(f"Sent public quiz results for user {self.user_id} in channel {self.interaction.channel.id}")
-                    break
-                except Exception as e:
-                    retries += 1
-                    logger.warning(f"Error sending public quiz results (attempt {retries}/{self.max_retries}): {e}")
-                    if retries >= self.max_retries:
-                        logger.error(f"Failed to send public quiz results after {self.max_retries} attempts")
-                    await asyncio.sleep(2 ** retries)
-            
-            # Send ephemeral results as well for the user's reference
-            retries = 0
-            while retries < self.max_retries:
-                try:
-                    await self.interaction.followup.send(content="Quiz finished! Results have been posted in the channel.", embed=embed, ephemeral=True)
-                    break
-                except discord.errors.NotFound:
-                    # Message was likely deleted
-                    logger.warning(f"Interaction not found when sending quiz results.")
-                    break
-                except Exception as e:
-                    retries += 1
-                    logger.warning(f"Error sending ephemeral quiz results (attempt {retries}/{self.max_retries}): {e}")
-                    if retries >= self.max_retries:
-                        logger.error(f"Failed to send ephemeral quiz results after {self.max_retries} attempts")
-                    await asyncio.sleep(2 ** retries)
-            
-            # Record score in database with retry logic
-            retries = 0
-            while retries < self.max_retries:
-                try:
-                    username = self.user_name if hasattr(self, 'user_name') and self.user_name else f"User-{self.user_id}"
-                    await record_user_score(self.user_id, username, self.quiz_id, self.score)
-                    logger.info(f"Recorded score for {username}: {self.score} points in quiz {self.quiz_id}")
-                    break
-                except Exception as e:
-                    retries += 1
-                    logger.warning(f"Error recording quiz score (attempt {retries}/{self.max_retries}): {e}")
-                    if retries >= self.max_retries:
-                        logger.error(f"Failed to record quiz score after {self.max_retries} attempts: {e}")
-                    await asyncio.sleep(2 ** retries)
-            
-            # Notify the queue manager that this quiz is done
-            await quiz_queue.finish_quiz(self.user_id)
+            public_embed = self._results_embed("Quiz Completed", f"<@{self.user_id}> completed: {quiz_name}", creator_username)
+            
+            async def send_public():
+                if await self._retry(lambda: self.interaction.channel.send(embed=public_embed), "public quiz results", swallow=()):
+                    logger.info("Sent public quiz results for user %s in channel %s", self.user_id, self.interaction.channel.id)
+            
+            # The sends and the score don't depend on each other, so run them together
+            ending = [
+                # Send public results to the channel
+                send_public(),
+                # Send ephemeral results as well for the user's reference
+                self._retry(
+                    lambda: self.interaction.followup.send(content="Quiz finished! Results have been posted in the channel.", embed=embed, ephemeral=True),
+                    "ephemeral quiz results"
+                ),
+                self._finalize(),
+            ]
+            # Edit the question message with the thank you message and no buttons
+            if self.latest_response:
+                ending.append(self._retry(
+                    lambda: self.latest_response.edit(content=None, embed=thank_you_embed, view=None),
+                    "thank you message"
+                ))
+            for error in await asyncio.gather(*ending, return_exceptions=True):
+                if isinstance(error, Exception):
+                    logger.error("Error ending quiz for user %s: %s", self.user_id, error)
         
         except Exception as e:
-            logger.error(f"Error in end_quiz: {e}")
+            logger.error("Error in end_quiz: %s", e)
+            # Still record the score and free the quiz slot if the results failed part way
+            await self._finalize()
+
+    async def _retry(self, coro_factory, what, swallow=(discord.errors.NotFound,)):
+        """Await coro_factory() with exponential backoff, returning whether it succeeded"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await coro_factory()
+                return True
+            except swallow:
+                # The message or interaction is gone; retrying won't bring it back
+                logger.warning("Message not found when sending %s.", what)
+                return False
+            except Exception as e:
+                logger.warning("Error sending %s (attempt %s/%s): %s", what, attempt, self.max_retries, e)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(2 ** attempt)
+        logger.error("Failed to send %s after %s attempts", what, self.max_retries)
+        return False
+
+    async def _finalize(self):
+        """Queue the score and tell the queue manager the quiz is done, at most once per quiz"""
+        if self._score_recorded or self.user_id not in quiz_queue.active_quizzes:
+            return
+        self._score_recorded = True
+        
+        # Queue the score for the batch writer so the end of the quiz isn't held up by the database
+        username = self.user_name or f"User-{self.user_id}"
+        queue_user_score(self.user_id, username, self.quiz_id, self.score)
+        
+        # Notify the queue manager that this quiz is done
+        await quiz_queue.finish_quiz(self.user_id)
+
+    def _arm_auto_end(self, timeout_seconds):
+        """Schedule the quiz to end automatically if the user doesn't end it within timeout_seconds"""
+        # Only the final question waits to be auto-ended
+        if self.index != self._last_index or self.auto_end_timer:
+            return
+        self.auto_end_timer = asyncio.get_running_loop().call_later(timeout_seconds, self._fire_auto_end, timeout_seconds)
+
+    def _fire_auto_end(self, timeout_seconds):
+        """Start auto-ending the quiz once its auto-end timeout has passed"""
+        self.auto_end_timer = None
+        if not self._is_ended:
+            task = asyncio.create_task(self.auto_end_quiz(timeout_seconds))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
 
     async def auto_end_quiz(self, timeout_seconds=60):
-        """Automatically end the quiz after a specified timeout if user doesn't end it manually"""
+        """End the quiz after its auto-end timeout has passed, if the user didn't end it manually"""
         try:
-            await asyncio.sleep(timeout_seconds)
-            
             # Check if quiz has already ended
-            if self.user_id not in quiz_queue.active_quizzes or self._is_ended:
+            if self._is_ended or self.user_id not in quiz_queue.active_quizzes:
                 return
             
-            logger.info(f"Auto-ending quiz for user {self.user_id} after {timeout_seconds} seconds of inactivity")
+            logger.info("Auto-ending quiz for user %s after %s seconds of inactivity", self.user_id, timeout_seconds)
             
-            # Update the last question embed to thank the player
+            # End the quiz, letting end_quiz replace the last question with the auto-end notice
             thank_embed = discord.Embed(
                 title="Quiz Auto-Completed",
                 description="Your quiz has been automatically completed due to inactivity. Results are being sent to the channel.",
                 color=discord.Color.yellow()
             )
-            
-            # Create an empty view with no buttons
-            empty_view = discord.ui.View()
-            
-            # Try to update the message if it exists
-            if self.latest_response:
-                try:
-                    await self.latest_response.edit(embed=thank_embed, view=empty_view)
-                except Exception as e:
-                    logger.warning(f"Failed to update message during auto-end: {e}")
-            
-            # End the quiz
-            await self.end_quiz()
+            await self.end_quiz(thank_you_embed=thank_embed)
         
         except asyncio.CancelledError:
-            # Task was cancelled normally (user ended quiz manually)
-            logger.debug(f"Auto-end timer cancelled for user {self.user_id}")
-            pass
+            # Task was cancelled, e.g. on shutdown
+            logger.debug("Auto-end cancelled for user %s", self.user_id)
+            raise
         except Exception as e:
-            logger.error(f"Error in auto-end quiz timer: {e}", exc_info=True)
-            # Still try to end the quiz
-            if not self._is_ended:
-                try:
+            logger.error("Error in auto-end quiz timer: %s", e, exc_info=True)
+            # Still try to end the quiz, or at least record its score
+            try:
+                if self._is_ended:
+                    await self._finalize()
+                else:
                     await self.end_quiz()
-                except Exception:
-                    pass
+            except Exception as e:
+                logger.error("Error ending quiz after auto-end failure: %s", e)
+
+    async def _on_progress(self, interaction):
+        """Handle the "Next Question" / "End Quiz" button shown after each answer"""
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This quiz is not for you!", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        
+        # Ignore repeat clicks; the button is re-enabled when it is shown after the next answer
+        if self._progress_button.disabled:
+            return
+        self._progress_button.disabled = True
+        
+        if self.index == self._last_index:
+            # Replace the last question with a thank you while the results are sent
+            thank_embed = discord.Embed(
+                title="Thank You!",
+                description="Thanks for completing the quiz. Your final results are coming up!",
+                color=discord.Color.green()
+            )
+            self.transitioning = False
+            await self.end_quiz(thank_you_embed=thank_embed)
+        else:
+            # Move to the next question
+            self.index += 1
+            self.transitioning = False
+            await self.show_question()
 
     def cancel_timer(self):
         """Cancel the current timer if one exists"""
@@ -530,53 +555,63 @@ class EphemeralQuizView(discord.ui.View):
             self.current_timer = None
         
         # Also cancel auto_end_timer if it exists
-        if hasattr(self, 'auto_end_timer') and self.auto_end_timer:
+        if self.auto_end_timer:
             self.auto_end_timer.cancel()
             self.auto_end_timer = None
 
     async def run_timer(self, message, embed, question_index, question_instance_id):
-        """Run timer for a question"""
+        """Run timer for a question, waking only when the footer is due an update or the question is answered"""
         start_time = time.time()
         try:
             # Store the timer's start time
             self.start_time = start_time
-            time_left = self.timer_task
+            answered = self._answered
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timer_task
             
-            while time_left > 0:
-                # Sleep first to avoid immediate update
-                await asyncio.sleep(1)
-                time_left -= 1
+            while True:
+                remaining = deadline - loop.time()
+                
+                # Next footer update: every 3 seconds, or every second once time is low, to reduce API calls
+                time_left = math.ceil(remaining) - 1
+                while time_left > 5 and time_left % 3:
+                    time_left -= 1
+                
+                try:
+                    await asyncio.wait_for(answered.wait(), timeout=max(0, remaining - max(time_left, 0)))
+                    return  # Answered before time ran out
+                except asyncio.TimeoutError:
+                    pass
+                
+                if time_left <= 0:
+                    break
+                
+                # Stop if we're no longer on the same question or quiz has ended
+                if self.index != question_index or self._is_ended:
+                    logger.debug(f"Timer stopped: index changed or quiz ended for user {self.user_id}")
+                    return
                 
-                # Update only every 3 seconds or when time is low to reduce API calls
-                if time_left % 3 == 0 or time_left <= 5:
-                    # Stop if we're no longer on the same question or quiz has ended
-                    if self.index != question_index or self._is_ended:
-                        logger.debug(f"Timer stopped: index changed or quiz ended for user {self.user_id}")
+                # Skip the edit if an answer is already being handled; it will replace this message anyway
+                if self.transitioning or answered.is_set():
+                    return
+                
+                # Update the footer text with remaining time
+                new_footer = f"Time left: {time_left} seconds ⏳ | Quiz ID: {question_instance_id}"
+                embed.set_footer(text=new_footer)
+                
+                # Try to update the message
+                try:
+                    await message.edit(embed=embed)
+                except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
+                    logger.warning(f"Failed to update timer for user {self.user_id}: {str(e)}")
+                    # Don't retry on these specific errors
+                    if isinstance(e, (discord.NotFound, discord.Forbidden)):
                         return
-                    
-                    # Update the footer text with remaining time
-                    new_footer = f"Time left: {time_left} seconds ⏳ | Quiz ID: {question_instance_id}"
-                    embed.set_footer(text=new_footer)
-                    
-                    # Try to update the message
-                    try:
-                        await message.edit(embed=embed)
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-                        logger.warning(f"Failed to update timer for user {self.user_id}: {str(e)}")
-                        # Don't retry on these specific errors
-                        if isinstance(e, (discord.NotFound, discord.Forbidden)):
-                            return
             
-            # Time's up - check if we're still on the same question and not transitioning
-            if self.index == question_index and not self.transitioning and not self._is_ended:
+            # Time's up - check if we're still on the same question; process_timeout checks for a transition in progress
+            if self.index == question_index and not self._is_ended:
                 logger.info(f"Time's up for question {question_index+1} for user {self.user_id}")
-                self.transitioning = True
-                
-                try:
-                    # Process timeout (no answer selected)
-                    await self.process_timeout(message, question_instance_id)
-                finally:
-                    self.transitioning = False
+                await self.process_timeout(message, question_instance_id)
                     
         except asyncio.CancelledError:
             # Timer was cancelled, exit silently
@@ -611,39 +646,31 @@ class EphemeralQuizView(discord.ui.View):
             await self.end_quiz()
             return
 
-        question_data = self.questions[self.index]
-        question_text = question_data[2]
+        question = self.questions[self.index]
         
-        # Safely parse options with error handling
-        try:
-            options = json.loads(question_data[3])
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in question options: {question_data[3]}")
-            options = {"A": "Error loading options", "B": "Please report this issue"}
+        # Create question embed from the option fields built at load time
+        embed = discord.Embed.from_dict({
+            "title": f"Question {self.index + 1}/{len(self.questions)}",
+            "description": question.text,
+            "color": QUESTION_COLOR,
+            "fields": list(question.fields),
+            "footer": {"text": f"ID: {self.message_id}"},  # The unique ID
+        })
         
-        # Create question embed
-        embed = discord.Embed(
-            title=f"Question {self.index + 1}/{len(self.questions)}", 
-            description=question_text, 
-            color=discord.Color.blue()
-        )
-        
-        # Add options as fields
-        for key, value in options.items():
-            embed.add_field(name=key, value=value, inline=False)
-        
-        # Add the unique ID to the footer
-        embed.set_footer(text=f"ID: {self.message_id}")
-        
-        # Clear previous buttons and add new ones
+        # Clear previous buttons and re-add the reusable answer buttons, creating more only when needed
         self.clear_items()
-        for key in options.keys():
-            button = EphemeralQuizButton(key, question_data, self)
+        for position, key in enumerate(question.options):
+            if position == len(self._answer_buttons):
+                self._answer_buttons.append(EphemeralQuizButton(key, question, self))
+            button = self._answer_buttons[position]
+            button.reset(key, question)
             self.add_item(button)
 
         # Set the start time for this question
         self.start_time = time.time()
         self.transitioning = False
+        self._answered = asyncio.Event()
+        question_instance_id = f"{self.message_id}_{self.index}"
         
         # Show the question with retry logic
         retries = 0
@@ -655,7 +682,7 @@ class EphemeralQuizView(discord.ui.View):
                     self.latest_response = await self.interaction.followup.send(embed=embed, view=self, ephemeral=True)
                 
                 # Start a new timer
-                self.current_timer = asyncio.create_task(self.run_timer(self.latest_response, embed, self.index, self.message_id))
+                self.current_timer = asyncio.create_task(self.run_timer(self.latest_response, embed, self.index, question_instance_id))
                 break
             except discord.errors.NotFound:
                 logger.warning(f"Message not found when showing question {self.index + 1}. Creating new message.")
@@ -664,7 +691,7 @@ class EphemeralQuizView(discord.ui.View):
                 try:
                     self.latest_response = await self.interaction.followup.send(embed=embed, view=self, ephemeral=True)
                     # Start a new timer
-                    self.current_timer = asyncio.create_task(self.run_timer(self.latest_response, embed, self.index, self.message_id))
+                    self.current_timer = asyncio.create_task(self.run_timer(self.latest_response, embed, self.index, question_instance_id))
                     break
                 except Exception as inner_e:
                     logger.error(f"Error creating new message: {inner_e}")
@@ -682,12 +709,20 @@ class EphemeralQuizView(discord.ui.View):
 
 class EphemeralQuizButton(discord.ui.Button):
     """Button for ephemeral quiz answers with error handling"""
-    def __init__(self, key, question_data, quiz_view):
+    def __init__(self, key, question, quiz_view):
         super().__init__(label=key, style=discord.ButtonStyle.primary)
         self.key = key
-        self.question_data = question_data
+        self.question = question
         self.quiz_view = quiz_view
 
+    def reset(self, key, question):
+        """Reuse this button for an option of another question"""
+        self.key = key
+        self.label = key
+        self.question = question
+        self.style = discord.ButtonStyle.primary
+        self.disabled = False
+
     # Modify the callback method in EphemeralQuizButton class
     async def callback(self, interaction: discord.Interaction):
         # Only the quiz owner can interact with these buttons
@@ -702,24 +737,17 @@ class EphemeralQuizButton(discord.ui.Button):
             
         self.quiz_view.transitioning = True
         
-        # Cancel the timer
-        self.quiz_view.cancel_timer()
+        # Stop the timer
+        self.quiz_view._answered.set()
         
         async with self.quiz_view.lock:
             try:
-                # Get maximum score with default fallback
-                max_score = 10  # Default score
-                try:
-                    max_score = int(self.question_data[5])
-                except (IndexError, TypeError, ValueError):
-                    logger.warning(f"Invalid max score for question, using default of {max_score}")
-                
-                total_time = self.quiz_view.timer_task  # Total time allowed
+                # Maximum score, already defaulted at load time if invalid
+                max_score = self.question.max_score
                 
-                # Disable all buttons to prevent multiple answers
+                # Disable all buttons to prevent multiple answers; every item in the view is a button
                 for child in self.quiz_view.children:
-                    if isinstance(child, discord.ui.Button):
-                        child.disabled = True
+                    child.disabled = True
                 
                 # Calculate time taken to answer
                 time_taken = time.time() - self.quiz_view.start_time
@@ -727,10 +755,10 @@ class EphemeralQuizButton(discord.ui.Button):
                 # Check if answer is correct and award points
                 embed = interaction.message.embeds[0]
                 
-                correct_answer = self.question_data[4]
+                correct_answer = self.question.correct
                 if self.key == correct_answer:  # Correct answer
                     # Linear scaling: score decreases as time increases
-                    time_penalty_ratio = max(0, 1 - (time_taken / total_time))
+                    time_penalty_ratio = max(0, 1 - time_taken * self.quiz_view._inv_timer)
                     scored_points = int(max_score * time_penalty_ratio)
                     
                     self.quiz_view.score += scored_points
@@ -752,7 +780,7 @@ class EphemeralQuizButton(discord.ui.Button):
                     
                     # Find the correct button and highlight it
                     for child in self.quiz_view.children:
-                        if isinstance(child, discord.ui.Button) and child.label == correct_answer:
+                        if child.label == correct_answer:
                             child.style = discord.ButtonStyle.success
                     
                     # Add feedback
@@ -763,10 +791,10 @@ class EphemeralQuizButton(discord.ui.Button):
                     )
                     
                     # Add explanation if available
-                    if len(self.question_data) > 6 and self.question_data[6]:  # Check if explanation exists
+                    if self.question.explanation:  # Check if explanation exists
                         embed.add_field(
                             name="Explanation",
-                            value=self.question_data[6],
+                            value=self.question.explanation,
                             inline=False
                         )
                 
@@ -774,67 +802,29 @@ class EphemeralQuizButton(discord.ui.Button):
                 embed.set_footer(text=f"ID: {self.quiz_view.message_id}")
                 
                 # Check if this is the last question
-                is_last_question = self.quiz_view.index == len(self.quiz_view.questions) - 1
+                is_last_question = self.quiz_view.index == self.quiz_view._last_index
                 
-                # Add either "Next Question" or "End Quiz" button based on whether this is the last question
-                if is_last_question:
-                    end_button = discord.ui.Button(label="End Quiz", style=discord.ButtonStyle.primary)
-                    #
-                    async def end_callback(end_interaction):
-                        if end_interaction.user.id != self.quiz_view.user_id:
-                            await end_interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                            return
-                        
-                        await end_interaction.response.defer()
-                        
-                        # Update the last question embed to thank the player
-                        thank_embed = discord.Embed(
-                            title="Thank You!",
-                            description="Thanks for completing the quiz. Your final results are coming up!",
-                            color=discord.Color.green()
-                        )
-                        
-                        # Create an empty view with no buttons
-                        empty_view = discord.ui.View()
-                        
-                        try:
-                            await end_interaction.message.edit(embed=thank_embed, view=empty_view)
-                        except Exception as e:
-                            logger.error(f"Error updating thank you message: {e}")
-                        
-                        # End the quiz
-                        self.quiz_view.transitioning = False
-                        await self.quiz_view.end_quiz()
-                    
-                    end_button.callback = end_callback
-                    self.quiz_view.add_item(end_button)
-                else:
-                    next_button = discord.ui.Button(label="Next Question", style=discord.ButtonStyle.primary)
-                    
-                    async def next_callback(next_interaction):
-                        if next_interaction.user.id != self.quiz_view.user_id:
-                            await next_interaction.response.send_message("This quiz is not for you!", ephemeral=True)
-                            return
-                        
-                        await next_interaction.response.defer()
-                        
-                        # Move to the next question
-                        self.quiz_view.index += 1
-                        self.quiz_view.transitioning = False
-                        await self.quiz_view.show_question()
-                    
-                    next_button.callback = next_callback
-                    self.quiz_view.add_item(next_button)
+                # Add the view's reusable "Next Question" / "End Quiz" button
+                progress_button = self.quiz_view._progress_button
+                progress_button.label = "End Quiz" if is_last_question else "Next Question"
+                progress_button.disabled = False
+                self.quiz_view.add_item(progress_button)
                 
                 # Update message with retry logic
                 try:
-                    await interaction.response.edit_message(embed=embed, view=self.quiz_view)
-                    self.quiz_view.latest_response = await interaction.original_response()
+                    callback = await interaction.response.edit_message(embed=embed, view=self.quiz_view)
+                    # Keep editing through this button's interaction: its token is fresh, while the
+                    # /take_quiz token behind the old handle expires 15 minutes after the command
+                    message = callback.resource if callback else None
+                    if isinstance(message, discord.InteractionMessage):
+                        self.quiz_view.latest_response = message
+                    else:
+                        self.quiz_view.latest_response = await interaction.original_response()
                     
                     # Start auto-end timer if this is the last question
                     if is_last_question:
                         # Auto-end the quiz after 2 minutes if user doesn't manually end it
-                        self.quiz_view.auto_end_timer = asyncio.create_task(self.quiz_view.auto_end_quiz(120))
+                        self.quiz_view._arm_auto_end(120)
                     
                 except discord.errors.NotFound:
                     logger.warning(f"Message not found when updating answer. Attempting to create new message.")
@@ -849,7 +839,7 @@ class EphemeralQuizButton(discord.ui.Button):
                         # Start auto-end timer if this is the last question
                         if is_last_question:
                             # Auto-end the quiz after 2 minutes if user doesn't manually end it
-                            self.quiz_view.auto_end_timer = asyncio.create_task(self.quiz_view.auto_end_quiz(120))
+                            self.quiz_view._arm_auto_end(120)
                     
                     except Exception as e:
                         logger.error(f"Failed to create new message after NotFound error: {e}")
@@ -858,8 +848,8 @@ class EphemeralQuizButton(discord.ui.Button):
                     # Try to defer and continue anyway
                     try:
                         await interaction.response.defer()
-                    except:
-                        pass
+                    except (discord.HTTPException, discord.InteractionResponded) as e:
+                        logger.debug(f"Could not defer answer interaction: {e}")
             
             except Exception as e:
                 logger.error(f"Unhandled error in button callback: {e}")
@@ -869,5 +859,5 @@ class EphemeralQuizButton(discord.ui.Button):
                         "An error occurred processing your answer. Please try again or restart the quiz.",
                         ephemeral=True
                     )
-                except:
-                    pass
\ No newline at end of file
+                except (discord.HTTPException, discord.InteractionResponded) as e:
+                    logger.debug(f"Could not send answer error message: {e}")
\ No newline at end of file
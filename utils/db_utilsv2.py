@@ -5,7 +5,7 @@ from typing import Optional, List, Tuple, Dict, Any, Union
 from config import CONFIG
 import json
 import functools
-from datetime import datetime, timedelta
+import time
 
 logger = logging.getLogger('badgey.db_utilsv2')
 
@@ -18,37 +18,61 @@ def timed_cache(seconds=300):
         seconds (int): Number of seconds to cache the result
         
     Returns:
-        Decorated function with caching behavior
+        Decorated function with caching behavior. The wrapper also exposes
+        invalidate(*args) to drop one positional-args entry and cache_clear()
+        to drop everything, for callers that change the underlying data.
     """
     def decorator(func):
         cache = {}
+        in_flight = {}  # key -> task still fetching that entry, shared by concurrent callers
+        
+        def store(key, task):
+            # Cache a finished fetch, unless it was invalidated while in flight
+            if in_flight.get(key) is not task:
+                return
+            del in_flight[key]
+            if task.cancelled() or task.exception() is not None:
+                return
+            now = time.monotonic()
+            cache[key] = (now + seconds, task.result())
+            
+            # Cleanup old cache entries periodically
+            if len(cache) > 100:  # Prevent unlimited growth
+                expired_keys = [k for k, v in cache.items() if v[0] <= now]
+                for k in expired_keys:
+                    del cache[k]
         
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            # Create a cache key from the function args and kwargs
-            key = str(args) + str(sorted(kwargs.items()))
+            # Create a cache key from the function args and kwargs (must be hashable)
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
             cached_result = cache.get(key)
             
             # Return cached result if it exists and hasn't expired
-            if cached_result and cached_result['expiry'] > datetime.now():
+            if cached_result and cached_result[0] > time.monotonic():
                 logger.debug(f"Cache hit for {func.__name__}{args}")
-                return cached_result['data']
-                
-            # Otherwise call the function and cache the result
-            result = await func(*args, **kwargs)
-            cache[key] = {
-                'data': result,
-                'expiry': datetime.now() + timedelta(seconds=seconds)
-            }
+                return cached_result[1]
             
-            # Cleanup old cache entries periodically
-            if len(cache) > 100:  # Prevent unlimited growth
-                current_time = datetime.now()
-                expired_keys = [k for k, v in cache.items() if v['expiry'] < current_time]
-                for k in expired_keys:
-                    del cache[k]
+            # Otherwise call the function, letting concurrent misses for the same key share one call
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[key] = task
+                task.add_done_callback(functools.partial(store, key))
             
-            return result
+            # Shielded so one caller being cancelled doesn't cancel the fetch for the others
+            return await asyncio.shield(task)
+        
+        def invalidate(*args):
+            cache.pop(args, None)
+            in_flight.pop(args, None)
+        
+        def cache_clear():
+            cache.clear()
+            in_flight.clear()
+        
+        wrapper.invalidate = invalidate
+        wrapper.cache_clear = cache_clear
         return wrapper
     return decorator
 
@@ -315,10 +339,10 @@ async def setup_db() -> None:
         raise DatabaseConnectionError(f"Unexpected DB setup error: {e}")
 
 # GET functions
-@timed_cache(seconds=60)
+@timed_cache(seconds=300)
 async def get_quiz_name(quiz_id: int) -> Optional[Tuple]:
     """
-    Get details of a specific quiz (cached for 60 seconds)
+    Get details of a specific quiz (cached for 5 minutes)
     
     Args:
         quiz_id (int): ID of the quiz
@@ -588,6 +612,8 @@ async def edit_question(question_id: int, question_text: Optional[str] = None,
         
         # Execute the query
         await execute_query(query, tuple(params))
+        # Only the question ID is known here, so drop every cached question list
+        get_quiz_questions.cache_clear()
         return True
     except DatabaseQueryError as e:
         logger.error(f"Failed to edit question {question_id}: {str(e)}")
@@ -616,6 +642,8 @@ async def update_question(question_id: int, text: str, options: dict,
             WHERE question_id = %s
         """
         await execute_query(query, (text, options_json, correct_answer, points, question_id))
+        # Only the question ID is known here, so drop every cached question list
+        get_quiz_questions.cache_clear()
         return True
     except DatabaseQueryError as e:
         logger.error(f"Failed to update question {question_id}: {str(e)}")
@@ -644,6 +672,8 @@ async def update_quiz_name(quiz_id: int, new_name: str) -> bool:
         # Update quiz name
         update_query = "UPDATE quizzes SET quiz_name = %s WHERE quiz_id = %s"
         await execute_query(update_query, (new_name, quiz_id))
+        get_quiz_name.invalidate(quiz_id)
+        get_all_quizzes.cache_clear()
         return True
     except DatabaseQueryError as e:
         logger.error(f"Failed to update quiz name for quiz {quiz_id}: {str(e)}")
@@ -677,38 +707,141 @@ async def record_user_score(user_id: int, username: str, quiz_id: int, score: in
         return False
         
     try:
-        # Check if the user already has a score for this quiz
-        check_query = "SELECT score FROM user_scores WHERE user_id = %s AND quiz_id = %s"
-        existing_score_result = await fetch_one(check_query, (user_id, quiz_id))
-        
-        if existing_score_result:
-            existing_score = existing_score_result[0]
-            # Only update if new score is higher
-            if score > existing_score:
-                update_query = """
-                    UPDATE user_scores 
-                    SET score = %s, 
-                        completion_date = NOW() 
-                    WHERE user_id = %s AND quiz_id = %s
-                """
-                await execute_query(update_query, (score, user_id, quiz_id))
-                logger.info(f"Updated score from {existing_score} to {score} for user {username} (ID: {user_id}) on quiz {quiz_id}")
-            else:
-                logger.info(f"Kept existing higher score {existing_score} for user {username} (ID: {user_id}) on quiz {quiz_id}")
-        else:
-            # Insert new score
-            insert_query = """
-                INSERT INTO user_scores (user_id, user_name, quiz_id, score, completion_date) 
-                VALUES (%s, %s, %s, %s, NOW())
-            """
-            await execute_query(insert_query, (user_id, username, quiz_id, score))
-            logger.info(f"Recorded new score {score} for user {username} (ID: {user_id}) on quiz {quiz_id}")
+        # Insert the score, or keep the higher of the old and new scores, in one pooled round trip.
+        # completion_date is assigned first so it still compares against the old score
+        upsert_query = """
+            INSERT INTO user_scores (user_id, user_name, quiz_id, score, completion_date) 
+            VALUES (%s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE 
+                completion_date = IF(VALUES(score) > score, NOW(), completion_date),
+                score = GREATEST(score, VALUES(score))
+        """
+        await execute_query(upsert_query, (user_id, username, quiz_id, score))
+        logger.info(f"Recorded score {score} for user {username} (ID: {user_id}) on quiz {quiz_id}")
         
         return True
     except (DatabaseConnectionError, DatabaseQueryError) as e:
         logger.error(f"Failed to record score for user {username} (ID: {user_id}) on quiz {quiz_id}: {str(e)}")
         return False
 
+async def record_user_scores_batch(scores: List[Tuple[int, str, int, int]]) -> bool:
+    """
+    Record several users' scores in a single statement, keeping each user's highest score
+    
+    Args:
+        scores (List[Tuple[int, str, int, int]]): List of (user_id, username, quiz_id, score) tuples
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    # Validate inputs, dropping rows record_user_score would reject
+    rows = []
+    for user_id, username, quiz_id, score in scores:
+        if not isinstance(user_id, int) or user_id <= 0 or not isinstance(quiz_id, int) or quiz_id <= 0 or not isinstance(score, int):
+            logger.error(f"Invalid score row: user_id={user_id}, quiz_id={quiz_id}, score={score}")
+            continue
+        rows.append((user_id, username, quiz_id, score))
+    
+    if not rows:
+        return True  # Nothing to do
+    
+    # completion_date is assigned first so it still compares against the old score
+    insert_query = f"""
+        INSERT INTO user_scores (user_id, user_name, quiz_id, score, completion_date) 
+        VALUES {", ".join(["(%s, %s, %s, %s, NOW())"] * len(rows))}
+        ON DUPLICATE KEY UPDATE 
+            completion_date = IF(VALUES(score) > score, NOW(), completion_date),
+            score = GREATEST(score, VALUES(score))
+    """
+    params = tuple(value for row in rows for value in row)
+    
+    try:
+        await execute_query(insert_query, params)
+        logger.info(f"Recorded {len(rows)} scores in one batch")
+        return True
+    except (DatabaseConnectionError, DatabaseQueryError) as e:
+        logger.error(f"Failed to record batch of {len(rows)} scores: {str(e)}")
+        return False
+
+# --- Batched score writer --- #
+# Quiz modules queue finished scores here; one writer task saves them with record_user_scores_batch.
+
+SCORE_BATCH_SIZE = 64
+SCORE_FLUSH_DELAY = 0.05  # seconds to wait for more scores before writing a batch
+# Whole-batch attempts. Each attempt already retries MAX_RETRIES times inside execute_query,
+# so a second attempt only helps with outages longer than that backoff
+SCORE_BATCH_ATTEMPTS = 2
+SCORE_BATCH_RETRY_DELAY = 5  # seconds between whole-batch attempts
+
+_score_queue = asyncio.Queue(maxsize=1000)  # (user_id, username, quiz_id, score) tuples
+_score_writer_task = None
+_direct_score_writes = set()  # Scores written directly because the queue was full
+
+async def _write_score_batch(scores: List[Tuple[int, str, int, int]]) -> None:
+    """Write one batch of queued scores, falling back to one write per score if the batch keeps failing"""
+    for attempt in range(1, SCORE_BATCH_ATTEMPTS + 1):
+        # record_user_scores_batch reports database errors by returning False
+        if await record_user_scores_batch(scores):
+            return
+        if attempt < SCORE_BATCH_ATTEMPTS:
+            logger.warning(f"Batch of {len(scores)} scores failed (attempt {attempt}/{SCORE_BATCH_ATTEMPTS}). Retrying in {SCORE_BATCH_RETRY_DELAY}s")
+            await asyncio.sleep(SCORE_BATCH_RETRY_DELAY)
+    
+    # One bad row (e.g. a quiz deleted mid-attempt) fails the whole statement, so write the
+    # scores one at a time and only lose the ones that fail on their own
+    logger.warning(f"Batch of {len(scores)} scores failed after {SCORE_BATCH_ATTEMPTS} attempts. Writing them one at a time")
+    for user_id, username, quiz_id, score in scores:
+        if not await record_user_score(user_id, username, quiz_id, score):
+            logger.error(f"Dropped quiz score {score} for user {username} (ID: {user_id}) on quiz {quiz_id}")
+
+async def _score_writer() -> None:
+    """Write queued scores to the database in batches"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _score_queue.get()]
+        deadline = loop.time() + SCORE_FLUSH_DELAY
+        while len(batch) < SCORE_BATCH_SIZE:
+            try:
+                batch.append(await asyncio.wait_for(_score_queue.get(), timeout=max(0, deadline - loop.time())))
+            except asyncio.TimeoutError:
+                break
+        try:
+            # Shielded so cancelling the writer doesn't abandon a batch mid-write
+            await asyncio.shield(_write_score_batch(batch))
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(batch)} scores: {str(e)}")
+        finally:
+            for _ in batch:
+                _score_queue.task_done()
+
+def queue_user_score(user_id: int, username: str, quiz_id: int, score: int) -> None:
+    """
+    Queue a user's score for the batch writer, keeping their highest score like record_user_score.
+    Writes the score directly in the background if the queue is full.
+    
+    Args:
+        user_id (int): Discord user ID
+        username (str): Discord username
+        quiz_id (int): Quiz ID
+        score (int): User's score
+    """
+    global _score_writer_task
+    if _score_writer_task is None or _score_writer_task.done():
+        _score_writer_task = asyncio.create_task(_score_writer())
+    try:
+        _score_queue.put_nowait((user_id, username, quiz_id, score))
+    except asyncio.QueueFull:
+        task = asyncio.create_task(record_user_score(user_id, username, quiz_id, score))
+        _direct_score_writes.add(task)
+        task.add_done_callback(_direct_score_writes.discard)
+
+async def flush_score_writes() -> None:
+    """Wait until every queued or directly written score has been saved, used on shutdown"""
+    if _score_writer_task is not None and not _score_writer_task.done():
+        await _score_queue.join()
+    if _direct_score_writes:
+        await asyncio.gather(*_direct_score_writes, return_exceptions=True)
+
 async def add_quiz(quiz_name: str, creator_id: str, creator_username: str = None) -> Optional[int]:
     """
     Add a new quiz to the database
@@ -769,6 +902,7 @@ async def add_quiz(quiz_name: str, creator_id: str, creator_username: str = None
             await cursor.execute("COMMIT")
             
             logger.info(f"Quiz '{quiz_name}' inserted successfully with ID {quiz_id}")
+            get_all_quizzes.cache_clear()
             return quiz_id
             
     except Exception as e:
@@ -859,6 +993,7 @@ async def add_question(quiz_id: int, question_text: str, options: Union[dict, st
             VALUES (%s, %s, %s, %s, %s, %s)
         """
         await execute_query(query, (quiz_id, question_text, options_json, correct_answer, score, explanation))
+        get_quiz_questions.invalidate(quiz_id)
         logger.info(f"Added question to quiz {quiz_id}: {question_text[:30]}...")
         return True
     except DatabaseQueryError as e:
@@ -879,6 +1014,9 @@ async def delete_quiz(quiz_id: int) -> bool:
     try:
         # Delete the quiz
         await execute_query("DELETE FROM quizzes WHERE quiz_id = %s", (quiz_id,))
+        get_quiz_name.invalidate(quiz_id)
+        get_quiz_questions.invalidate(quiz_id)
+        get_all_quizzes.cache_clear()
         
         logger.info(f"Quiz {quiz_id}, questions and score deleted successfully")
         return True
@@ -1040,8 +1178,13 @@ async def execute_transaction(queries: List[Tuple[str, Tuple]]) -> bool:
 
 # --- Guild Settings Functions --- #
 
-async def set_guild_setting(guild_id: int, setting_key: str, setting_value: str) -> None:
-    """Insert or update a setting for a specific guild."""
+async def set_guild_setting(guild_id: int, setting_key: str, setting_value: str) -> bool:
+    """
+    Insert or update a setting for a specific guild.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
     query = """
         INSERT INTO guild_settings (guild_id, setting_key, setting_value)
         VALUES (%s, %s, %s)
@@ -1050,13 +1193,21 @@ async def set_guild_setting(guild_id: int, setting_key: str, setting_value: str)
     params = (guild_id, setting_key, setting_value)
     try:
         await execute_query(query, params)
+        get_guild_setting.invalidate(guild_id, setting_key)
         logger.info(f"Set setting '{setting_key}' for guild {guild_id}")
+        return True
     except DatabaseQueryError as e:
         logger.error(f"Failed to set setting '{setting_key}' for guild {guild_id}: {e}")
-        # Depending on desired behavior, you might re-raise or handle differently
+        return False
 
+@timed_cache(seconds=60)
 async def get_guild_setting(guild_id: int, setting_key: str) -> Optional[str]:
-    """Retrieve a specific setting for a guild."""
+    """
+    Retrieve a specific setting for a guild (cached for 1 minute).
+    
+    Raises:
+        DatabaseQueryError: If the lookup fails, so the failure isn't cached as a missing setting
+    """
     query = "SELECT setting_value FROM guild_settings WHERE guild_id = %s AND setting_key = %s"
     params = (guild_id, setting_key)
     try:
@@ -1069,4 +1220,4 @@ async def get_guild_setting(guild_id: int, setting_key: str) -> Optional[str]:
             return None
     except DatabaseQueryError as e:
         logger.error(f"Failed to retrieve setting '{setting_key}' for guild {guild_id}: {e}")
-        return None # Return None on error to avoid breaking calling code
\ No newline at end of file
+        raise
\ No newline at end of file